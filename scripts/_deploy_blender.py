@@ -23,13 +23,18 @@ POD_CONFIG = {
     "env": {},
 }
 
+# Pod states that will never transition to RUNNING
+TERMINAL_STATES = {"EXITED", "TERMINATED"}
+
 def main():
     # Check for existing
-    pods = runpod.get_pods()
-    existing = [p for p in pods if p.get("name") == "blender-workstation" and p.get("desiredStatus") == "RUNNING"]
+    pod = next(
+        (p for p in runpod.get_pods()
+         if p.get("name") == POD_CONFIG["name"] and p.get("desiredStatus") == "RUNNING"),
+        None,
+    )
     
-    if existing:
-        pod = existing[0]
+    if pod:
         print(f"[REUSE] Found existing pod: {pod['id']}")
     else:
         print("[CREATE] Deploying blender-workstation (A6000, 70GB RAM)...")
@@ -44,23 +49,30 @@ def main():
     pod_id = pod["id"]
     print(f"[WAIT] Waiting for pod {pod_id} to be ready...")
     
-    for _ in range(60):
+    deadline = time.monotonic() + 300
+    delay = 3.0
+    while time.monotonic() < deadline:
         try:
             pod = runpod.get_pod(pod_id)
         except Exception:
-            time.sleep(5)
-            continue
+            pod = None
         
-        if pod.get("desiredStatus") == "RUNNING":
-            runtime = pod.get("runtime") or {}
-            for p in runtime.get("ports", []):
-                if p.get("privatePort") == 22 and p.get("isIpPublic"):
+        if pod:
+            status = pod.get("desiredStatus")
+            if status in TERMINAL_STATES:
+                print(f"[ERROR] Pod entered terminal state: {status}")
+                return
+            # desiredStatus is RUNNING from creation; runtime appears once the container is up
+            runtime = pod.get("runtime")
+            if status == "RUNNING" and runtime:
+                if any(p.get("privatePort") == 22 and p.get("isIpPublic") for p in runtime.get("ports") or []):
                     break
-            else:
-                time.sleep(5)
-                continue
-            break
-        time.sleep(5)
+                # Container is up and SSH is imminent: keep polling tightly
+                delay = 3.0
+        
+        time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        if not (pod and pod.get("runtime")):
+            delay = min(delay * 1.5, 30.0)
     else:
         print("[TIMEOUT] Pod did not become ready in 5 minutes.")
         return
@@ -82,16 +94,16 @@ def main():
     print(f"     Pod ID:  {pod_id}")
     print(f"     SSH:     ssh -p {ssh_port} root@{ssh_ip}")
     
-    # Upload and run start_blender.sh
-    print("[UPLOAD] Sending start_blender.sh...")
+    # Stream start_blender.sh over stdin and launch it in the same SSH session
+    print("[DEPLOY] Sending and launching start_blender.sh (runs in background)...")
     script_path = ROOT / "docker" / "start_blender.sh"
-    scp_cmd = f'scp -P {ssh_port} -i "{SSH_KEY_PATH}" -o StrictHostKeyChecking=no "{script_path}" root@{ssh_ip}:/workspace/'
-    subprocess.run(scp_cmd, shell=True, check=True)
-    
-    print("[RUN] Launching Blender setup (runs in background)...")
-    ssh_cmd = f'ssh -p {ssh_port} -i "{SSH_KEY_PATH}" -o StrictHostKeyChecking=no root@{ssh_ip}'
-    remote = 'chmod +x /workspace/start_blender.sh && nohup /workspace/start_blender.sh < /dev/null > /workspace/startup.log 2>&1 & sleep 1'
-    subprocess.run(f'{ssh_cmd} "{remote}"', shell=True, check=True)
+    script = script_path.read_bytes().replace(b"\r\n", b"\n")
+    ssh_argv = ["ssh", "-p", ssh_port, "-i", SSH_KEY_PATH, "-o", "StrictHostKeyChecking=no", f"root@{ssh_ip}"]
+    remote = (
+        "cat > /workspace/start_blender.sh && chmod +x /workspace/start_blender.sh && "
+        "{ nohup /workspace/start_blender.sh < /dev/null > /workspace/startup.log 2>&1 & } && sleep 1"
+    )
+    subprocess.run(ssh_argv + [remote], input=script, check=True)
     
     print()
     print("=" * 55)
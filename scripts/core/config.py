@@ -6,26 +6,72 @@ centralized configuration access.
 """
 
 from __future__ import annotations
+import importlib.util
+import math
 import os
+import pickle
+import struct
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
-# Try to import YAML
-try:
-    import yaml
-except ImportError:
-    import subprocess
-    import sys
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "pyyaml"], check=True)
-    import yaml
+# YAML is a hard dependency; never pip-install from inside an import
+if importlib.util.find_spec("yaml") is None:
+    raise RuntimeError("PyYAML is required. Install it with: pip install pyyaml")
+import yaml
 
 # Load environment
 load_dotenv()
 
+# Cache header: source mtime_ns + size
+_CACHE_HEADER = struct.Struct("=qq")
 
-@dataclass
+
+def _load_yaml_cached(path: Path) -> Dict[str, Any]:
+    """Load a YAML file, reusing a pickled sidecar keyed by mtime and size."""
+    st = path.stat()
+    key = _CACHE_HEADER.pack(st.st_mtime_ns, st.st_size)
+    cache_path = path.with_suffix(path.suffix + ".cache")
+    
+    try:
+        with open(cache_path, "rb") as f:
+            if f.read(_CACHE_HEADER.size) == key:
+                return pickle.load(f)
+    except Exception:
+        # Any unreadable or corrupt sidecar just means re-parsing the YAML
+        pass
+    
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    
+    # Write atomically; a failed cache write is never fatal
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(key)
+            pickle.dump(data, f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    
+    return data
+
+
+def _env_ms(name: str, default: float) -> float:
+    """Read a positive millisecond setting; a malformed value is never fatal."""
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if math.isfinite(value) and value > 0 else default
+
+
+@dataclass(frozen=True)
 class Template:
     """Pod template configuration."""
     name: str
@@ -61,6 +107,35 @@ class Template:
         }
 
 
+# Built-in templates used when config.yaml is missing (shared, read-only)
+_DEFAULT_TEMPLATES: Dict[str, Template] = {
+    "prod": Template(
+        name="ltx2-comfyui-prod",
+        gpu_type_id="NVIDIA RTX A6000",
+        cloud_type="SECURE",
+        min_vram=48,
+        script="start.sh",
+        desc="RTX A6000 (48GB) - High Performance"
+    ),
+    "value": Template(
+        name="ltx2-comfyui-value",
+        gpu_type_id="NVIDIA A40",
+        cloud_type="COMMUNITY",
+        min_vram=48,
+        script="start.sh",
+        desc="NVIDIA A40 (48GB) - Best Value"
+    ),
+    "wan2gp": Template(
+        name="wan2gp-video-gen",
+        gpu_type_id="NVIDIA A40",
+        cloud_type="COMMUNITY",
+        min_vram=48,
+        script="start_wan2gp.sh",
+        desc="NVIDIA A40 (48GB) - Wan2GP Standard"
+    ),
+}
+
+
 @dataclass
 class Config:
     """Application configuration."""
@@ -70,6 +145,9 @@ class Config:
     default_image: str = "runpod/pytorch:2.4.0-py3.11-cuda12.4.1-devel-ubuntu22.04"
     templates: Dict[str, Template] = field(default_factory=dict)
     model_folders: list = field(default_factory=list)
+    # wait_for_pod backoff bounds, in seconds
+    poll_initial: float = 0.5
+    poll_max: float = 5.0
     
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> "Config":
@@ -78,6 +156,8 @@ class Config:
             runpod_api_key=os.getenv("RUNPOD_API_KEY", ""),
             ssh_key_path=os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519"),
             hf_token=os.getenv("HF_TOKEN", ""),
+            poll_initial=_env_ms("RPA_POLL_INITIAL_MS", 500) / 1000,
+            poll_max=_env_ms("RPA_POLL_MAX_MS", 5000) / 1000,
         )
         
         # Default config path
@@ -85,8 +165,7 @@ class Config:
             config_path = Path(__file__).parent.parent.parent / "config.yaml"
         
         if config_path.exists():
-            with open(config_path) as f:
-                data = yaml.safe_load(f)
+            data = _load_yaml_cached(config_path)
             
             # Load default image
             config.default_image = data.get("default_image", config.default_image)
@@ -122,41 +201,10 @@ class Config:
     
     def _load_default_templates(self) -> None:
         """Load default templates when no config file exists."""
-        self.templates = {
-            "prod": Template(
-                name="ltx2-comfyui-prod",
-                gpu_type_id="NVIDIA RTX A6000",
-                cloud_type="SECURE",
-                min_vram=48,
-                script="start.sh",
-                desc="RTX A6000 (48GB) - High Performance"
-            ),
-            "value": Template(
-                name="ltx2-comfyui-value",
-                gpu_type_id="NVIDIA A40",
-                cloud_type="COMMUNITY",
-                min_vram=48,
-                script="start.sh",
-                desc="NVIDIA A40 (48GB) - Best Value"
-            ),
-            "wan2gp": Template(
-                name="wan2gp-video-gen",
-                gpu_type_id="NVIDIA A40",
-                cloud_type="COMMUNITY",
-                min_vram=48,
-                script="start_wan2gp.sh",
-                desc="NVIDIA A40 (48GB) - Wan2GP Standard"
-            ),
-        }
-
-
-# Singleton config instance
-_config: Optional[Config] = None
+        self.templates = dict(_DEFAULT_TEMPLATES)
 
 
+@lru_cache(maxsize=None)
 def get_config() -> Config:
     """Get or create the global config instance."""
-    global _config
-    if _config is None:
-        _config = Config.load()
-    return _config
+    return Config.load()
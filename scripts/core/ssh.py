@@ -6,16 +6,69 @@ connection pooling concepts, and consistent error handling.
 """
 
 from __future__ import annotations
+import asyncio
 import os
+import platform
+import posixpath
+import shlex
+import shutil
+import socket
 import subprocess
+import sys
 import time
 import logging
-from dataclasses import dataclass
-from functools import wraps
-from typing import Optional, Callable, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from typing import Optional, Callable, Any, Dict, List, Tuple, Union
+
+# Optional: asyncssh for concurrent in-process sessions
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+HAS_ASYNCSSH = asyncssh is not None
+
+# Connect/auth/transport failures after which callers fall back to the ssh
+# binary (which also honours ssh-agent, ~/.ssh/config and passphrased keys)
+ASYNCSSH_ERRORS: Tuple[type, ...] = (OSError, asyncio.TimeoutError) + (
+    (asyncssh.Error, asyncssh.KeyImportError) if asyncssh else ()
+)
 
 log = logging.getLogger("rpa.ssh")
 
+IS_WINDOWS = platform.system() == "Windows"
+
+# OpenSSH connection multiplexing: the first call opens a master connection
+# and later ssh/scp calls reuse it (not supported by Windows OpenSSH).
+# The socket lives in ~/.ssh, not a world-writable dir: these sessions carry
+# .env secrets. Same path as rpa_legacy.py so both CLIs share masters.
+# Long enough to span an interactive session; see SSHManager.close_masters().
+MUX_OPTS: List[str] = [] if IS_WINDOWS else [
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=~/.ssh/cm-%C",
+    "-o", "ControlPersist=600",
+]
+
+
+@lru_cache(maxsize=None)
+def expand_key_path(key_path: str) -> str:
+    """Expand ~ in an SSH key path (memoized)."""
+    return os.path.expanduser(key_path)
+
+
+@lru_cache(maxsize=None)
+def has_zstd() -> bool:
+    """Check (once) whether local zstd and tar are available for streaming."""
+    return bool(shutil.which("zstd") and shutil.which("tar"))
+
+
+@lru_cache(maxsize=None)
+def has_rsync() -> bool:
+    """Check (once) whether a local rsync is available."""
+    return shutil.which("rsync") is not None
+
 
 def retry(max_attempts: int = 3, delay: float = 2.0, backoff: float = 1.5):
     """Decorator to retry failed operations with exponential backoff."""
@@ -43,55 +96,245 @@ def retry(max_attempts: int = 3, delay: float = 2.0, backoff: float = 1.5):
     return decorator
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PodInfo:
-    """Pod connection information."""
+    """Pod connection information (immutable; derived strings are precomputed)."""
     id: str
     name: str
     ip: str
     port: str
     gpu_name: str = "Unknown"
     cost_per_hr: float = 0.0
+    _proxy_base: str = field(init=False, repr=False, compare=False)
+    _ssh_suffix: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_proxy_base", f"https://{self.id}-")
+        object.__setattr__(self, "_ssh_suffix", f"-o StrictHostKeyChecking=no root@{self.ip}")
     
     def proxy_url(self, port: int = 8888) -> str:
         """Generate RunPod proxy URL."""
-        return f"https://{self.id}-{port}.proxy.runpod.net/"
+        return f"{self._proxy_base}{port}.proxy.runpod.net/"
     
     def ssh_command(self, key_path: str) -> str:
         """Generate base SSH command."""
-        expanded_key = os.path.expanduser(key_path)
-        return f'ssh -p {self.port} -i "{expanded_key}" -o StrictHostKeyChecking=no root@{self.ip}'
+        return f'ssh -p {self.port} -i "{expand_key_path(key_path)}" {self._ssh_suffix}'
 
 
 class SSHManager:
     """Manages SSH connections and operations."""
     
     def __init__(self, key_path: str = "~/.ssh/id_ed25519"):
-        self.key_path = os.path.expanduser(key_path)
+        self.key_path = expand_key_path(key_path)
+        # (ip, port) -> argv; callers must copy (e.g. `+ [...]`), never mutate
+        self._base_cmd_cache: Dict[Tuple[str, str], List[str]] = {}
+        self._scp_cmd_cache: Dict[str, List[str]] = {}
+        # (ip, port) of pods whose mux master this session may have opened
+        self._mux_hosts: set = set()
+        # (ip, port) -> whether the pod has zstd (probed once)
+        self._remote_zstd: Dict[Tuple[str, str], bool] = {}
     
-    def get_base_cmd(self, pod: PodInfo) -> str:
-        """Get base SSH command for a pod."""
-        return f'ssh -p {pod.port} -i "{self.key_path}" -o StrictHostKeyChecking=no root@{pod.ip}'
+    def get_base_cmd(self, pod: PodInfo) -> List[str]:
+        """Get base SSH argv for a pod."""
+        key = (pod.ip, str(pod.port))
+        cmd = self._base_cmd_cache.get(key)
+        if cmd is None:
+            cmd = self._base_cmd_cache[key] = [
+                "ssh", "-p", key[1], "-i", self.key_path,
+                "-o", "StrictHostKeyChecking=no", *MUX_OPTS, f"root@{pod.ip}",
+            ]
+            if MUX_OPTS:
+                self._mux_hosts.add(key)
+        return cmd
     
-    @retry(max_attempts=3, delay=2.0)
-    def run_command(
+    def close_masters(self) -> None:
+        """Retire the mux masters this manager may have opened.
+        
+        Uses `-O stop` rather than `exit`: the socket is shared with other rpa
+        processes, so live sessions (a shell, a log tail) keep running and the
+        master exits once they finish.
+        """
+        for ip, port in self._mux_hosts:
+            subprocess.run(
+                ["ssh", "-p", port, *MUX_OPTS, "-O", "stop", f"root@{ip}"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        self._mux_hosts.clear()
+    
+    def get_scp_cmd(self, pod: PodInfo) -> List[str]:
+        """Get base SCP argv for a pod (sources/destination appended by caller)."""
+        port = str(pod.port)
+        cmd = self._scp_cmd_cache.get(port)
+        if cmd is None:
+            cmd = self._scp_cmd_cache[port] = [
+                "scp", "-P", port, "-i", self.key_path,
+                "-o", "StrictHostKeyChecking=no", *MUX_OPTS,
+            ]
+        return cmd
+    
+    def run_once(
         self, 
         pod: PodInfo, 
         command: str, 
         capture: bool = False,
         timeout: Optional[int] = None
     ) -> subprocess.CompletedProcess:
-        """Execute a command on the pod via SSH."""
-        ssh_cmd = f'{self.get_base_cmd(pod)} "{command}"'
-        
+        """Execute a command on the pod via SSH, without retries."""
         return subprocess.run(
-            ssh_cmd,
-            shell=True,
+            self.get_base_cmd(pod) + [command],
             capture_output=capture,
             text=True,
             timeout=timeout
         )
     
+    @retry(max_attempts=3, delay=2.0)
+    def run_command(
+        self, 
+        pod: PodInfo, 
+        command: str, 
+        capture: bool = False,
+        timeout: Optional[int] = None
+    ) -> subprocess.CompletedProcess:
+        """Execute a command on the pod via SSH."""
+        return self.run_once(pod, command, capture, timeout)
+    
+    def run_many(
+        self,
+        pods: List[PodInfo],
+        command: str,
+        max_workers: int = 16
+    ) -> List[Tuple[str, subprocess.CompletedProcess]]:
+        """Execute a command on several pods concurrently.
+        
+        Returns (pod_id, result) pairs in completion order. Pods whose
+        command still fails after retries are logged and left out.
+        """
+        results = []
+        if not pods:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pods))) as pool:
+            futures = {
+                pool.submit(self.run_command, pod, command, capture=True, timeout=30): pod
+                for pod in pods
+            }
+            for future in as_completed(futures):
+                pod = futures[future]
+                try:
+                    results.append((pod.id, future.result()))
+                except Exception as e:
+                    log.error(f"  {pod.name} ({pod.id}): {e}")
+        
+        return results
+    
+    async def aopen(self, pod: PodInfo) -> "asyncssh.SSHClientConnection":
+        """Open an in-process SSH connection to the pod (requires asyncssh)."""
+        if asyncssh is None:
+            raise RuntimeError("asyncssh is not installed. Run: pip install asyncssh")
+        
+        return await asyncssh.connect(
+            pod.ip,
+            port=int(pod.port),
+            username="root",
+            client_keys=[self.key_path],
+            known_hosts=None,
+        )
+    
+    async def arun_command(
+        self,
+        pod: PodInfo,
+        command: str,
+        timeout: Optional[int] = None,
+        conn: Optional["asyncssh.SSHClientConnection"] = None
+    ) -> "asyncssh.SSHCompletedProcess":
+        """Execute a command on the pod over asyncssh.
+        
+        Pass an open ``conn`` from aopen() to reuse one session across
+        several commands; otherwise a connection is opened and closed.
+        """
+        if conn is not None:
+            return await conn.run(command, check=False, timeout=timeout)
+        
+        async with await self.aopen(pod) as conn:
+            return await conn.run(command, check=False, timeout=timeout)
+    
+    async def arun_many(
+        self,
+        pods: List[PodInfo],
+        command: str,
+        timeout: Optional[int] = 30
+    ) -> List[Tuple[str, Any]]:
+        """Execute a command on several pods concurrently on one event loop.
+        
+        Returns (pod_id, result) pairs; failed pods carry the exception.
+        """
+        results = await asyncio.gather(
+            *(self.arun_command(pod, command, timeout=timeout) for pod in pods),
+            return_exceptions=True,
+        )
+        return [(pod.id, result) for pod, result in zip(pods, results)]
+    
+    async def aupload_files(
+        self,
+        pod: PodInfo,
+        local_paths: List[str],
+        remote_dir: str,
+        conn: Optional["asyncssh.SSHClientConnection"] = None
+    ) -> None:
+        """Upload several files concurrently over one SFTP session.
+        
+        Pass an open ``conn`` from aopen() to follow up with arun_command()
+        on the same connection.
+        """
+        if conn is None:
+            async with await self.aopen(pod) as conn:
+                return await self.aupload_files(pod, local_paths, remote_dir, conn)
+        
+        remote_dir = remote_dir.rstrip("/") or "/"
+        async with conn.start_sftp_client() as sftp:
+            await asyncio.gather(*(
+                sftp.put(path, posixpath.join(remote_dir, os.path.basename(path)), preserve=True)
+                for path in local_paths
+            ))
+    
+    async def adownload_dir(
+        self,
+        pod: PodInfo,
+        remote_dir: str,
+        local_dir: str,
+        conn: Optional["asyncssh.SSHClientConnection"] = None,
+        max_parallel: int = 8
+    ) -> List[str]:
+        """Download the contents of a remote directory over one SFTP session.
+        
+        Listing and transfer share a single connection, so no separate
+        emptiness probe is needed; up to ``max_parallel`` entries are
+        fetched concurrently. Returns the names that were fetched (empty
+        if the directory is empty or missing).
+        """
+        if conn is None:
+            async with await self.aopen(pod) as conn:
+                return await self.adownload_dir(pod, remote_dir, local_dir, conn, max_parallel)
+        
+        async with conn.start_sftp_client() as sftp:
+            try:
+                names = [n for n in await sftp.listdir(remote_dir) if n not in (".", "..")]
+            except asyncssh.SFTPNoSuchFile:
+                return []
+            if not names:
+                return []
+            
+            os.makedirs(local_dir, exist_ok=True)
+            limit = asyncio.Semaphore(max_parallel)
+            
+            async def _get(name: str) -> None:
+                async with limit:
+                    await sftp.get(posixpath.join(remote_dir, name), local_dir, recurse=True, preserve=True)
+            
+            # Many small frames: overlap their round trips on the one session
+            await asyncio.gather(*(_get(n) for n in names))
+            return names
+    
     def run_background(self, pod: PodInfo, command: str) -> None:
         """Run a command in the background on the pod."""
         # nohup with proper detach
@@ -106,12 +349,21 @@ class SSHManager:
         remote_path: str
     ) -> subprocess.CompletedProcess:
         """Upload a file to the pod via SCP."""
-        scp_cmd = (
-            f'scp -P {pod.port} -i "{self.key_path}" '
-            f'-o StrictHostKeyChecking=no "{local_path}" root@{pod.ip}:{remote_path}'
-        )
+        scp_cmd = self.get_scp_cmd(pod) + [local_path, f"root@{pod.ip}:{remote_path}"]
+        
+        return subprocess.run(scp_cmd, check=True, capture_output=True)
+    
+    @retry(max_attempts=2, delay=1.0)
+    def upload_files(
+        self,
+        pod: PodInfo,
+        local_paths: List[str],
+        remote_dir: str
+    ) -> subprocess.CompletedProcess:
+        """Upload several files into a remote directory with one SCP call."""
+        scp_cmd = self.get_scp_cmd(pod) + list(local_paths) + [f"root@{pod.ip}:{remote_dir.rstrip('/')}/"]
         
-        return subprocess.run(scp_cmd, shell=True, check=True, capture_output=True)
+        return subprocess.run(scp_cmd, check=True, capture_output=True)
     
     @retry(max_attempts=2, delay=1.0)
     def download_files(
@@ -121,18 +373,107 @@ class SSHManager:
         local_path: str,
         recursive: bool = True
     ) -> subprocess.CompletedProcess:
-        """Download files from the pod via SCP."""
-        r_flag = "-r" if recursive else ""
-        scp_cmd = (
-            f'scp -P {pod.port} -i "{self.key_path}" '
-            f'-o StrictHostKeyChecking=no {r_flag} root@{pod.ip}:{remote_path} "{local_path}"'
+        """Download files from the pod.
+        
+        Recursive downloads are streamed as a single zstd-compressed tar
+        when zstd is available on both ends; otherwise falls back to scp.
+        """
+        if recursive and has_zstd():
+            result = self._download_tar_zstd(pod, remote_path, local_path)
+            if result is not None:
+                return result
+        
+        r_flag = ["-r"] if recursive else []
+        scp_cmd = self.get_scp_cmd(pod) + r_flag + [f"root@{pod.ip}:{remote_path}", local_path]
+        
+        return subprocess.run(scp_cmd, check=True)
+    
+    def rsync_download(
+        self,
+        pod: PodInfo,
+        remote_dir: str,
+        local_dir: str
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Mirror a remote directory with rsync (only new/changed files move).
+        
+        Delta transfers with --partial/--inplace over the mux connection, so
+        changed files only move their differing blocks and interrupted pulls
+        resume. Cheap AEAD cipher and no compression (-z/SSH), since outputs
+        are already compressed media. Returns None if rsync is not installed
+        locally.
+        """
+        if not has_rsync():
+            return None
+        
+        rsh = shlex.join([
+            "ssh", "-p", str(pod.port), "-i", self.key_path,
+            "-o", "StrictHostKeyChecking=no",
+            "-c", "aes128-gcm@openssh.com", "-o", "Compression=no", *MUX_OPTS,
+        ])
+        os.makedirs(local_dir, exist_ok=True)
+        return subprocess.run([
+            "rsync", "-rlpt", "--partial", "--inplace", "--info=progress2", "-e", rsh,
+            f"root@{pod.ip}:{remote_dir.rstrip('/')}/", f"{local_dir.rstrip(os.sep)}/",
+        ])
+    
+    def _download_tar_zstd(
+        self,
+        pod: PodInfo,
+        remote_path: str,
+        local_path: str
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Stream `tar | zstd` from the pod into a local `zstd -d | tar -x`.
+        
+        Supports a plain path or a trailing `/*` (directory contents, as
+        scp expands it). Returns None if the stream could not be used.
+        """
+        remote_dir, name = posixpath.split(remote_path.rstrip("/"))
+        if name == "*":
+            src = "."
+        elif any(c in name for c in "*?["):
+            return None
+        else:
+            src = shlex.quote(name)
+        
+        if not self._pod_has_zstd(pod):
+            return None
+        
+        remote_cmd = (
+            "command -v zstd >/dev/null || exit 127; "
+            f"tar -C {shlex.quote(remote_dir or '/')} -cf - {src} | zstd -T0 -3 -c"
         )
+        os.makedirs(local_path, exist_ok=True)
         
-        return subprocess.run(scp_cmd, shell=True, check=True)
+        ssh_proc = subprocess.Popen(self.get_base_cmd(pod) + [remote_cmd], stdout=subprocess.PIPE)
+        unzstd = subprocess.Popen(["zstd", "-d", "-c", "-q"], stdin=ssh_proc.stdout, stdout=subprocess.PIPE)
+        ssh_proc.stdout.close()
+        untar = subprocess.Popen(["tar", "-C", local_path, "-xf", "-"], stdin=unzstd.stdout)
+        unzstd.stdout.close()
+        
+        codes = (untar.wait(), unzstd.wait(), ssh_proc.wait())
+        if any(codes):
+            log.warning(f"  Compressed transfer unavailable (exit {codes}), using scp.")
+            return None
+        return subprocess.CompletedProcess(ssh_proc.args, 0)
+    
+    def _pod_has_zstd(self, pod: PodInfo) -> bool:
+        """Whether zstd is installed on the pod (not a default on Ubuntu images).
+        
+        Probed once per pod, so a missing zstd costs one quiet round trip
+        instead of a broken pipeline on every download.
+        """
+        key = (pod.ip, str(pod.port))
+        if key not in self._remote_zstd:
+            try:
+                result = self.run_once(pod, "command -v zstd >/dev/null && echo YES || echo NO", capture=True, timeout=10)
+            except subprocess.TimeoutExpired:
+                return False
+            self._remote_zstd[key] = result.stdout.strip() == "YES"
+        return self._remote_zstd[key]
     
     def check_file_exists(self, pod: PodInfo, path: str) -> bool:
-        """Check if a file exists on the pod."""
-        result = self.run_command(
+        """Check if a file exists on the pod (cheap probe, not retried)."""
+        result = self.run_once(
             pod, 
             f'test -f {path} && echo YES || echo NO',
             capture=True,
@@ -141,8 +482,8 @@ class SSHManager:
         return result.stdout.strip() == "YES"
     
     def check_process_running(self, pod: PodInfo, process_name: str) -> bool:
-        """Check if a process is running on the pod."""
-        result = self.run_command(
+        """Check if a process is running on the pod (cheap probe, not retried)."""
+        result = self.run_once(
             pod,
             f'pgrep -f "{process_name}"',
             capture=True,
@@ -150,11 +491,74 @@ class SSHManager:
         )
         return bool(result.stdout.strip())
     
-    def tail_log(self, pod: PodInfo, log_path: str) -> None:
-        """Tail a log file on the pod (blocking)."""
-        ssh_cmd = f'{self.get_base_cmd(pod)} "tail -f {log_path}"'
-        subprocess.run(ssh_cmd, shell=True)
+    def tail_log(self, pod: PodInfo, log_path: Union[str, List[str]]) -> None:
+        """Tail a log file on the pod (blocking).
+        
+        Given several candidate paths, the first one that exists is picked
+        on the pod itself (the last is used if none exist yet), so no extra
+        round trip is needed to probe for it.
+        """
+        if isinstance(log_path, str):
+            subprocess.run(self.get_base_cmd(pod) + [f"tail -f {shlex.quote(log_path)}"])
+            return
+        
+        candidates = " ".join(shlex.quote(p) for p in log_path)
+        remote_cmd = (
+            f"for f in {candidates}; do [ -f \"$f\" ] && break; done; "
+            'echo "==> $f"; exec tail -F "$f"'
+        )
+        subprocess.run(self.get_base_cmd(pod) + [remote_cmd])
     
-    def interactive_shell(self, pod: PodInfo) -> None:
-        """Open an interactive shell to the pod."""
-        os.system(self.get_base_cmd(pod))
+    def open_tunnel(
+        self,
+        pod: PodInfo,
+        ports: List[int],
+        timeout: float = 15.0
+    ) -> Optional[subprocess.Popen]:
+        """Start a background `ssh -N -L` tunnel and wait until it listens.
+        
+        The tunnel owns its connection (no mux master) so it outlives this
+        process. Readiness is detected by probing the first local port
+        rather than sleeping. Returns None if ssh exits before it is up.
+        """
+        forwards = [arg for port in ports for arg in ("-L", f"{port}:127.0.0.1:{port}")]
+        argv = [
+            "ssh", "-p", str(pod.port), "-i", self.key_path,
+            "-o", "StrictHostKeyChecking=no", "-o", "ExitOnForwardFailure=yes",
+            "-N", *forwards, f"root@{pod.ip}",
+        ]
+        if IS_WINDOWS:
+            proc = subprocess.Popen(argv, creationflags=getattr(subprocess, "CREATE_NEW_CONSOLE", 0))
+        else:
+            proc = subprocess.Popen(
+                argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, start_new_session=True,
+            )
+        
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                return None
+            try:
+                with socket.create_connection(("127.0.0.1", ports[0]), timeout=0.5):
+                    return proc
+            except OSError:
+                time.sleep(0.1)
+        
+        log.warning(f"Tunnel not listening on {ports[0]} after {timeout:.0f}s")
+        return proc
+    
+    def interactive_shell(self, pod: PodInfo, replace_process: bool = False) -> None:
+        """Open an interactive shell to the pod.
+        
+        With replace_process=True the Python process is replaced by ssh via
+        os.execvp and this call never returns, so it must be the last action
+        of the caller (any cleanup has to happen first). Ignored on Windows,
+        where exec does not hand over the console.
+        """
+        argv = self.get_base_cmd(pod)
+        if replace_process and not IS_WINDOWS:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.execvp(argv[0], argv)
+        subprocess.run(argv)
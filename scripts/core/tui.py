@@ -6,32 +6,22 @@ progress bars, tables, and interactive menus.
 """
 
 from __future__ import annotations
-import sys
+import importlib.util
 from typing import Optional, List, Dict, Any, Callable
 
-# Try to import rich
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-    from rich.prompt import Prompt, Confirm
-    from rich.text import Text
-    from rich.live import Live
-    from rich.layout import Layout
-    from rich import box
-except ImportError:
-    import subprocess
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "rich"], check=True)
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-    from rich.prompt import Prompt, Confirm
-    from rich.text import Text
-    from rich.live import Live
-    from rich.layout import Layout
-    from rich import box
+# Rich is a hard dependency; never pip-install from inside an import
+if importlib.util.find_spec("rich") is None:
+    raise RuntimeError("rich is required. Install it with: pip install rich")
+
+from rich.console import Console, Group
+from rich.table import Table
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from rich.prompt import Prompt, Confirm
+from rich.text import Text
+from rich.live import Live
+from rich.layout import Layout
+from rich import box
 
 
 class RichTUI:
@@ -47,18 +37,20 @@ class RichTUI:
     
     def header(self, title: str, subtitle: str = "") -> None:
         """Display a styled header."""
+        self.console.print(self._header_panel(title, subtitle))
+    
+    def _header_panel(self, title: str, subtitle: str = "") -> Panel:
         text = Text()
         text.append(f"🚀 {title}\n", style="bold cyan")
         if subtitle:
             text.append(subtitle, style="dim")
         
-        panel = Panel(
+        return Panel(
             text,
             box=box.DOUBLE,
             border_style="cyan",
             padding=(0, 2),
         )
-        self.console.print(panel)
     
     def section(self, title: str, icon: str = "📦") -> None:
         """Print a section header."""
@@ -127,7 +119,7 @@ class RichTUI:
         table.add_column("Cost/hr", style="magenta", justify="right")
         
         for i, pod in enumerate(pods, 1):
-            gpu = pod.get("machine", {}).get("gpuDisplayName", "Unknown")
+            gpu = (pod.get("machine") or {}).get("gpuDisplayName", "Unknown")
             cost = pod.get("costPerHr", 0)
             table.add_row(
                 str(i),
@@ -156,6 +148,26 @@ class RichTUI:
         choice = Prompt.ask("Select option", default="").strip().upper()
         return choice if choice else None
     
+    def menu_screen(
+        self,
+        title: str,
+        subtitle: str,
+        sections: List[tuple]
+    ) -> Group:
+        """Build a full menu screen once so each redraw is a single print.
+        
+        Args:
+            sections: List of (title, icon, lines) tuples; lines are markup
+            
+        Returns:
+            A renderable for console.print()
+        """
+        body = []
+        for sec_title, icon, lines in sections:
+            body += [f"\n{icon} [bold yellow]{sec_title}[/]", f"[dim]{'─' * 40}[/]", *lines]
+        body.append("")
+        return Group(self._header_panel(title, subtitle), Text.from_markup("\n".join(body)))
+    
     def prompt(self, message: str, default: str = "") -> str:
         """Get user input."""
         return Prompt.ask(message, default=default)
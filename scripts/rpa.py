@@ -8,46 +8,99 @@ Uses Rich TUI, YAML config, and clean abstractions.
 
 from __future__ import annotations
 import argparse
+import asyncio
 import os
 import platform
+import random
 import sys
 import time
-import subprocess
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 # Ensure we can import local modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # === Core Imports ===
 from core import get_config, get_tui, SSHManager, PodInfo
-
-# === RunPod SDK ===
-try:
-    import runpod
-except ImportError:
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "runpod"], check=True)
-    import runpod
+from core.ssh import ASYNCSSH_ERRORS, HAS_ASYNCSSH
 
 # === Global State ===
 IS_WINDOWS = platform.system() == "Windows"
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DOCKER_DIR = ROOT_DIR / "docker"
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+OUTPUT_DIR = ROOT_DIR / "output"
+ENV_FILE = ROOT_DIR / ".env"
 config = get_config()
 tui = get_tui()
 ssh = SSHManager(config.ssh_key_path)
 
-if config.runpod_api_key:
-    runpod.api_key = config.runpod_api_key
+
+# === RunPod SDK ===
+@lru_cache(maxsize=None)
+def get_runpod():
+    """Import the RunPod SDK on first API use and set the key.
+    
+    The SDK is slow to import; deferring it lets the menu render first.
+    """
+    try:
+        import runpod
+    except ImportError:
+        raise RuntimeError("The RunPod SDK is required. Install it with: pip install runpod") from None
+    
+    if config.runpod_api_key:
+        runpod.api_key = config.runpod_api_key
+    return runpod
 
 
 # ============================================================
 # POD HELPERS
 # ============================================================
 
+# Short-lived cache so consecutive TUI actions share one get_pods() call
+_pods_cache: Dict[str, Any] = {"t": 0.0, "v": None}
+
+
+def get_pods_cached(ttl: float = 5.0) -> List[Dict[str, Any]]:
+    """Return runpod.get_pods(), reusing the last result for `ttl` seconds.
+
+    If the API call fails, the last known list is returned instead.
+    """
+    if _pods_cache["v"] is not None and time.monotonic() - _pods_cache["t"] < ttl:
+        return _pods_cache["v"]
+    try:
+        pods = get_runpod().get_pods()
+    except Exception as e:
+        # A transient API failure shouldn't break follow-up commands
+        if _pods_cache["v"] is None:
+            raise
+        tui.warning(f"RunPod API error ({e}); using cached pod list.")
+        return _pods_cache["v"]
+    _pods_cache["v"] = pods
+    _pods_cache["t"] = time.monotonic()
+    return pods
+
+
+def invalidate_pods_cache() -> None:
+    """Expire the cached pod list (call after creating/terminating pods).
+
+    The stale list is kept only as a fallback for API errors.
+    """
+    _pods_cache["t"] = float("-inf")
+
+
+# pod_id -> (monotonic time, cmd_status output)
+_status_cache: Dict[str, Tuple[float, str]] = {}
+STATUS_TTL = 5.0
+
+
 def get_running_pods() -> List[Dict[str, Any]]:
     """Fetch all running pods."""
     try:
-        pods = runpod.get_pods()
+        pods = get_pods_cached()
         return [p for p in pods if p.get("desiredStatus") == "RUNNING"]
     except Exception as e:
         tui.error(f"Failed to fetch pods: {e}")
@@ -102,23 +155,25 @@ def wait_for_pod(pod_id: str, timeout: int = 300) -> Optional[Dict[str, Any]]:
     """Wait for pod to become ready with SSH."""
     with tui.progress_spinner("Waiting for pod...") as progress:
         task = progress.add_task("Initializing...", total=None)
-        start = time.time()
+        deadline = time.monotonic() + timeout
+        delay = config.poll_initial  # exponential backoff up to config.poll_max
         
-        while time.time() - start < timeout:
+        while time.monotonic() < deadline:
             try:
-                pod = runpod.get_pod(pod_id)
+                pod = get_runpod().get_pod(pod_id)
                 progress.update(task, description=f"Status: {pod.get('desiredStatus', 'unknown')}")
             except Exception:
-                time.sleep(2)
-                continue
+                pod = None
             
-            if pod.get("desiredStatus") == "RUNNING":
+            if pod and pod.get("desiredStatus") == "RUNNING":
                 runtime = pod.get("runtime") or {}
                 for p in runtime.get("ports", []):
                     if p.get("privatePort") == 22 and p.get("isIpPublic"):
                         return pod
             
-            time.sleep(5)
+            jittered = delay + random.uniform(0, delay * 0.1)
+            time.sleep(min(jittered, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, config.poll_max)
     
     return None
 
@@ -142,26 +197,30 @@ def cmd_deploy(template_key: str, no_setup: bool = False) -> None:
     tui.status(f"Cloud: {template.cloud_type}")
     
     # Check for existing pod
-    pods = runpod.get_pods()
-    existing = [p for p in pods if p.get("name") == template.name and p.get("desiredStatus") == "RUNNING"]
+    pods = get_pods_cached()
+    existing = next(
+        (p for p in pods if p.get("name") == template.name and p.get("desiredStatus") == "RUNNING"),
+        None,
+    )
     
     if existing:
-        tui.warning(f"Found existing pod {existing[0]['id']}. Reusing.")
-        pod = existing[0]
+        tui.warning(f"Found existing pod {existing['id']}. Reusing.")
+        pod = existing
     else:
         tui.status("Creating pod...")
         pod_config = template.to_pod_config(config.default_image, config.hf_token)
         
         try:
-            pod = runpod.create_pod(**pod_config)
+            pod = get_runpod().create_pod(**pod_config)
         except Exception as e:
             tui.error(f"Creation failed: {e}")
             if template.cloud_type == "COMMUNITY":
                 tui.info("Retrying with SECURE cloud...")
                 pod_config["cloud_type"] = "SECURE"
-                pod = runpod.create_pod(**pod_config)
+                pod = get_runpod().create_pod(**pod_config)
             else:
                 return
+        invalidate_pods_cache()
     
     # Wait for ready
     pod = wait_for_pod(pod["id"])
@@ -176,25 +235,42 @@ def cmd_deploy(template_key: str, no_setup: bool = False) -> None:
     # Provisioning
     if not no_setup:
         tui.section("Provisioning", "📦")
-        root_dir = Path(__file__).parent.parent
-        
         files_to_upload = [
-            root_dir / "docker" / template.script,
-            root_dir / ".env",
+            DOCKER_DIR / template.script,
+            ENV_FILE,
         ]
         
         if template.setup_script:
-            files_to_upload.append(root_dir / "scripts" / template.setup_script)
+            files_to_upload.append(SCRIPTS_DIR / template.setup_script)
         
-        for f in files_to_upload:
-            if f.exists():
-                tui.status(f"Uploading {f.name}...")
-                ssh.upload_file(pod_info, str(f), f"/workspace/{f.name}")
-        
-        # Run startup script
-        tui.status(f"Executing {template.script}...")
+        existing_files = [str(f) for f in files_to_upload if f.exists()]
         remote_cmd = f"chmod +x /workspace/{template.script} && nohup /workspace/{template.script} < /dev/null > /workspace/startup.log 2>&1 & sleep 1"
-        ssh.run_command(pod_info, remote_cmd, timeout=30)
+        if existing_files:
+            tui.status(f"Uploading {', '.join(Path(f).name for f in existing_files)}...")
+        
+        provisioned = False
+        if HAS_ASYNCSSH:
+            # Concurrent uploads and the startup call share one connection
+            async def _provision() -> None:
+                async with await ssh.aopen(pod_info) as conn:
+                    if existing_files:
+                        await ssh.aupload_files(pod_info, existing_files, "/workspace", conn=conn)
+                    tui.status(f"Executing {template.script}...")
+                    await ssh.arun_command(pod_info, remote_cmd, timeout=30, conn=conn)
+            
+            try:
+                asyncio.run(_provision())
+                provisioned = True
+            except ASYNCSSH_ERRORS as e:
+                tui.warning(f"In-process SSH failed ({e}); retrying with ssh/scp.")
+        
+        if not provisioned:
+            if existing_files:
+                ssh.upload_files(pod_info, existing_files, "/workspace")
+            
+            # Run startup script
+            tui.status(f"Executing {template.script}...")
+            ssh.run_command(pod_info, remote_cmd, timeout=30)
         tui.info("Startup script launched. Use [W] Watch to monitor.")
     
     # Success
@@ -216,17 +292,10 @@ def cmd_connect() -> None:
     tui.section("Connecting", "🔗")
     tui.status("Opening tunnel (8888, 3000, 7860)...")
     
-    ssh_cmd = pod.ssh_command(config.ssh_key_path)
-    tunnel_args = "-N -L 8888:127.0.0.1:8888 -L 3000:127.0.0.1:3000 -L 7860:127.0.0.1:7860"
-    full_cmd = f"{ssh_cmd} {tunnel_args}"
-    
-    if IS_WINDOWS:
-        subprocess.Popen(f'start "RunPod Tunnel" {full_cmd}', shell=True)
-    else:
-        subprocess.Popen(full_cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    
     tui.info(f"Proxy: {pod.proxy_url(8888)}")
-    time.sleep(3)
+    if not ssh.open_tunnel(pod, [8888, 3000, 7860]):
+        tui.error("Tunnel failed to start (ports in use or SSH refused).")
+        return
     
     webbrowser.open("http://127.0.0.1:8888")
     tui.success("Browser launched. Tunnel running in background.")
@@ -241,18 +310,13 @@ def cmd_watch() -> None:
     
     tui.section("Watching Logs", "👀")
     
-    # Determine log file
-    log_file = "/workspace/startup.log"
+    # Wan2GP pods prefer the runtime log once it exists; chosen on the pod
     if "wan2gp" in pod.name.lower():
-        if ssh.check_file_exists(pod, "/workspace/wan2gp_service.log"):
-            log_file = "/workspace/wan2gp_service.log"
-            tui.info("Watching runtime log...")
-        else:
-            tui.info("Watching startup log...")
+        tui.info("Watching runtime log (or startup log if not started yet)...")
+        ssh.tail_log(pod, ["/workspace/wan2gp_service.log", "/workspace/startup.log"])
     else:
         tui.info("Watching startup log...")
-    
-    ssh.tail_log(pod, log_file)
+        ssh.tail_log(pod, "/workspace/startup.log")
 
 
 def cmd_status() -> None:
@@ -270,7 +334,14 @@ def cmd_status() -> None:
         "echo '=== GPU ===' && nvidia-smi --query-gpu=gpu_name,utilization.gpu,memory.used,memory.total --format=csv,noheader"
     )
     
+    # Mashing [S] within a few seconds re-shows the last reading
+    cached = _status_cache.get(pod.id)
+    if cached and time.monotonic() - cached[0] < STATUS_TTL:
+        tui.console.print(cached[1])
+        return
+    
     result = ssh.run_command(pod, status_cmd, capture=True, timeout=30)
+    _status_cache[pod.id] = (time.monotonic(), result.stdout)
     tui.console.print(result.stdout)
 
 
@@ -283,16 +354,37 @@ def cmd_pull() -> None:
     
     tui.section("Pulling Content", "📥")
     
-    local_out = Path(__file__).parent.parent / "output"
+    local_out = OUTPUT_DIR
     local_out.mkdir(exist_ok=True)
     
+    remote_out = "/workspace/ComfyUI/output"
+    
+    # Repeat pulls: rsync only moves frames we don't have yet
+    result = ssh.rsync_download(pod, remote_out, str(local_out))
+    if result is not None and result.returncode == 0:
+        tui.success(f"Synced to {local_out}")
+        return
+    
+    # One SFTP session lists and fetches in the same connection
+    if HAS_ASYNCSSH:
+        try:
+            names = asyncio.run(ssh.adownload_dir(pod, remote_out, str(local_out)))
+        except ASYNCSSH_ERRORS as e:
+            tui.warning(f"In-process SSH failed ({e}); falling back to scp.")
+        else:
+            if not names:
+                tui.warning("No files found in remote output.")
+                return
+            tui.success(f"Synced {len(names)} item(s) to {local_out}")
+            return
+    
     # Check remote
-    result = ssh.run_command(pod, "ls -A /workspace/ComfyUI/output 2>/dev/null", capture=True)
+    result = ssh.run_command(pod, f"ls -A {remote_out} 2>/dev/null", capture=True)
     if not result.stdout.strip():
         tui.warning("No files found in remote output.")
         return
     
-    ssh.download_files(pod, "/workspace/ComfyUI/output/*", str(local_out))
+    ssh.download_files(pod, f"{remote_out}/*", str(local_out))
     tui.success(f"Synced to {local_out}")
 
 
@@ -303,8 +395,8 @@ def cmd_wallet() -> None:
     tui.wallet_summary(running, total)
 
 
-def cmd_shell() -> None:
-    """Open interactive shell."""
+def cmd_shell(exec_ssh: bool = False) -> None:
+    """Open interactive shell (exec_ssh replaces this process; CLI only)."""
     running = get_running_pods()
     pod = select_pod(running)
     if not pod:
@@ -312,13 +404,13 @@ def cmd_shell() -> None:
     
     tui.section("Shell", "📟")
     tui.info(f"Connecting to {pod.name}...")
-    ssh.interactive_shell(pod)
+    ssh.interactive_shell(pod, replace_process=exec_ssh)
 
 
 def cmd_list() -> None:
     """List all pods."""
     try:
-        pods = runpod.get_pods()
+        pods = get_pods_cached()
         if not pods:
             tui.warning("No pods found.")
             return
@@ -328,33 +420,56 @@ def cmd_list() -> None:
 
 
 def cmd_terminate(pod_id: Optional[str] = None) -> None:
-    """Terminate a pod."""
-    if not pod_id:
+    """Terminate one or more pods."""
+    if pod_id:
+        pod_ids = [pod_id]
+    else:
         running = get_running_pods()
         if not running:
             tui.warning("No active pods to terminate.")
             return
         
         tui.pod_table(running)
-        choice = tui.prompt(f"Select pod to terminate (1-{len(running)})")
+        choice = tui.prompt(f"Select pod(s) to terminate (1-{len(running)}, e.g. 1,3)")
         
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(running):
-                pod_id = running[idx]["id"]
+        pod_ids = []
+        for token in choice.replace(",", " ").split():
+            if token.isdigit():
+                idx = int(token) - 1
+                if not 0 <= idx < len(running):
+                    tui.warning(f"Invalid selection: {token}")
+                    return
+                pod_ids.append(running[idx]["id"])
             else:
-                tui.warning("Invalid selection.")
-                return
-        except ValueError:
-            # Allow pasting full ID
-            pod_id = choice.strip()
+                # Allow pasting full ID
+                pod_ids.append(token)
+        
+        pod_ids = list(dict.fromkeys(pod_ids))
+        if not pod_ids:
+            tui.info("Cancelled.")
+            return
     
-    if tui.confirm(f"Terminate {pod_id}?"):
-        tui.status("Terminating...")
-        runpod.terminate_pod(pod_id)
-        tui.success("Pod terminated. Billing stopped.")
-    else:
+    if not tui.confirm(f"Terminate {', '.join(pod_ids)}?"):
         tui.info("Cancelled.")
+        return
+    
+    tui.status("Terminating...")
+    rp = get_runpod()
+    failed = []
+    # Independent API calls: issue them concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(pod_ids))) as executor:
+        futures = {executor.submit(rp.terminate_pod, pid): pid for pid in pod_ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(futures[future])
+                tui.error(f"{futures[future]}: {e}")
+    invalidate_pods_cache()
+    
+    done = len(pod_ids) - len(failed)
+    if done:
+        tui.success(f"{done} pod(s) terminated. Billing stopped.")
 
 
 # ============================================================
@@ -362,37 +477,50 @@ def cmd_terminate(pod_id: Optional[str] = None) -> None:
 # ============================================================
 
 def cmd_interactive() -> None:
-    """Main interactive menu."""
+    """Main interactive menu.
+    
+    Remote actions share one multiplexed SSH connection per pod for the
+    whole session; it is closed on quit.
+    """
+    try:
+        _interactive_loop()
+    finally:
+        ssh.close_masters()
+
+
+def _interactive_loop() -> None:
+    """Draw the menu and dispatch choices until the user quits."""
+    # Templates and menu entries are fixed for the session: render them once
+    template_keys = list(config.templates.keys())
+    deploy_lines = []
+    for i, key in enumerate(template_keys, 1):
+        t = config.templates[key]
+        cloud = "🔒" if t.cloud_type == "SECURE" else "🌐"
+        deploy_lines.append(f"  [{i}] {cloud} {key.ljust(12)} {t.desc}")
+    
+    menu_items = [
+        ("C", "Connect (Tunnel)", "🔗", cmd_connect),
+        ("W", "Watch Logs", "👀", cmd_watch),
+        ("S", "Status", "📊", cmd_status),
+        ("P", "Pull Content", "📥", cmd_pull),
+        ("$", "Wallet", "💰", cmd_wallet),
+        ("H", "Shell", "📟", cmd_shell),
+        ("L", "List Pods", "📋", cmd_list),
+        ("K", "Terminate", "💀", cmd_terminate),
+        ("Q", "Quit", "🚪", None),
+    ]
+    dispatch = {key: handler for key, _, _, handler in menu_items if handler}
+    menu = tui.menu_screen(
+        "RUNPOD COMMAND CENTER", "v3.0 - Modular Architecture",
+        [
+            ("Deployment", "🚀", deploy_lines),
+            ("Management", "🛠️", [f"  [{key}] {icon} {label}" for key, label, icon, _ in menu_items]),
+        ],
+    )
+    
     while True:
         tui.clear()
-        tui.header("RUNPOD COMMAND CENTER", "v3.0 - Modular Architecture")
-        
-        # Templates section
-        tui.section("Deployment", "🚀")
-        template_keys = list(config.templates.keys())
-        for i, key in enumerate(template_keys, 1):
-            t = config.templates[key]
-            cloud = "🔒" if t.cloud_type == "SECURE" else "🌐"
-            tui.console.print(f"  [{i}] {cloud} {key.ljust(12)} {t.desc}")
-        
-        # Management section
-        tui.section("Management", "🛠️")
-        menu_items = [
-            ("C", "Connect (Tunnel)", "🔗"),
-            ("W", "Watch Logs", "👀"),
-            ("S", "Status", "📊"),
-            ("P", "Pull Content", "📥"),
-            ("$", "Wallet", "💰"),
-            ("H", "Shell", "📟"),
-            ("L", "List Pods", "📋"),
-            ("K", "Terminate", "💀"),
-            ("Q", "Quit", "🚪"),
-        ]
-        
-        for key, label, icon in menu_items:
-            tui.console.print(f"  [{key}] {icon} {label}")
-        
-        tui.console.print()
+        tui.console.print(menu)
         choice = tui.prompt("Select").strip().upper()
         
         # Numeric = deploy
@@ -407,22 +535,10 @@ def cmd_interactive() -> None:
         if choice == "Q":
             tui.success("Goodbye!")
             sys.exit(0)
-        elif choice == "C":
-            cmd_connect()
-        elif choice == "W":
-            cmd_watch()
-        elif choice == "S":
-            cmd_status()
-        elif choice == "P":
-            cmd_pull()
-        elif choice == "$":
-            cmd_wallet()
-        elif choice == "H":
-            cmd_shell()
-        elif choice == "L":
-            cmd_list()
-        elif choice == "K":
-            cmd_terminate()
+        
+        handler = dispatch.get(choice)
+        if handler:
+            handler()
         else:
             tui.warning("Invalid option.")
         
@@ -468,7 +584,7 @@ def main():
         "status": cmd_status,
         "pull": cmd_pull,
         "wallet": cmd_wallet,
-        "shell": cmd_shell,
+        "shell": lambda: cmd_shell(exec_ssh=True),
         "list": cmd_list,
         "terminate": lambda: cmd_terminate(getattr(args, 'pod_id', None)),
         "interactive": cmd_interactive,
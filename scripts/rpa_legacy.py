@@ -11,12 +11,21 @@ Templates:
 
 from __future__ import annotations
 import argparse
+import json
 import logging
 import os
 import platform
+import random
+import re
+import shlex
+import shutil
+import socket
 import sys
 import time
 import subprocess
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
@@ -33,22 +42,48 @@ log = logging.getLogger("rpa")
 load_dotenv()
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Try to import runpod
-try:
-    import runpod
-except ImportError:
-    log.info("Installing runpod...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "runpod"], check=True)
-    import runpod
-
 # Configuration
 RUNPOD_API_KEY = os.getenv("RUNPOD_API_KEY")
 SSH_KEY_PATH = os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519")
+KEY_PATH = os.path.expanduser(SSH_KEY_PATH)
 HF_TOKEN = os.getenv("HF_TOKEN")
 IS_WINDOWS = platform.system() == "Windows"
 
-if RUNPOD_API_KEY:
-    runpod.api_key = RUNPOD_API_KEY
+# SSH connection multiplexing: the first ssh/scp to a pod becomes the master
+# and later calls reuse its TCP+auth channel (unsupported by Windows OpenSSH).
+SSH_MUX_ARGS = [] if IS_WINDOWS else [
+    "-o", "ControlMaster=auto", "-o", "ControlPath=~/.ssh/cm-%C", "-o", "ControlPersist=600",
+]
+SSH_MUX_OPTS = " ".join(SSH_MUX_ARGS)
+
+# Key + host-key options shared by every ssh/scp argv
+SSH_BASE_OPTS = ("-i", KEY_PATH, "-o", "StrictHostKeyChecking=no")
+
+# rsync is rarely present on Windows; scp remains the fallback
+HAS_RSYNC = shutil.which("rsync") is not None
+
+# Max sources per scp invocation; keeps argv well under Windows' command-line limit
+SCP_BATCH = 64
+
+@lru_cache(maxsize=None)
+def get_runpod():
+    """Import the RunPod SDK on first API use (it is slow to import) and set the key.
+    
+    SSH-only commands with a remembered pod never pay the import.
+    """
+    try:
+        import runpod
+    except ImportError:
+        # Only self-install when run as the CLI, never on a library import
+        if __name__ != "__main__":
+            raise
+        log.info("Installing runpod...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "-q", "runpod"], check=True)
+        import runpod
+    
+    if RUNPOD_API_KEY:
+        runpod.api_key = RUNPOD_API_KEY
+    return runpod
 
 # Templates
 TEMPLATES = {
@@ -118,6 +153,17 @@ TEMPLATES = {
     }
 }
 
+# Repo root and the files each template uploads on deploy (resolved once)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+TEMPLATE_FILES = {
+    key: (
+        ROOT_DIR / "docker" / t["script"],
+        ROOT_DIR / "scripts" / t.get("setup_script", "setup_models.py"),  # Default to LTX setup
+        ROOT_DIR / ".env",
+    )
+    for key, t in TEMPLATES.items()
+}
+
 MODEL_FOLDERS = [
     "checkpoints",
     "unet",
@@ -132,10 +178,85 @@ MODEL_FOLDERS = [
     "upscale_models"
 ]
 
+# guess_category matchers, longest folder first so 'clip_vision' beats 'clip'
+_SORTED_FOLDERS = sorted(MODEL_FOLDERS, key=len, reverse=True)
+_FOLDER_RANK = {f: i for i, f in enumerate(_SORTED_FOLDERS)}
+_FOLDER_ALT = "|".join(re.escape(f) for f in _SORTED_FOLDERS)
+_CAT_PART_RE = re.compile(rf"(?<![^/])({_FOLDER_ALT})(?=/|$)")  # a whole path segment
+_CAT_ANY_RE = re.compile(rf"(?=({_FOLDER_ALT}))")  # anywhere, overlapping
+
 DEFAULT_IMAGE = "runpod/pytorch:2.4.0-py3.11-cuda12.4.1-devel-ubuntu22.04"
 
+# Short-lived cache of runpod.get_pods() so consecutive menu actions share one API call
+_pods_cache = {"t": 0.0, "v": None}
+
+def get_pods_cached(ttl: float = 5.0) -> List[Dict[str, Any]]:
+    """Return runpod.get_pods(), reusing the last result for `ttl` seconds.
+
+    If the API call fails, the last known list is returned instead.
+    """
+    if _pods_cache["v"] is not None and time.monotonic() - _pods_cache["t"] < ttl:
+        return _pods_cache["v"]
+    try:
+        pods = get_runpod().get_pods()
+    except Exception as e:
+        # A transient API failure shouldn't break follow-up commands
+        if _pods_cache["v"] is None:
+            raise
+        print(f"⚠️  RunPod API error ({e}); using cached pod list.")
+        return _pods_cache["v"]
+    _pods_cache["v"] = pods
+    _pods_cache["t"] = time.monotonic()
+    return pods
+
+def invalidate_pods_cache() -> None:
+    """Expire the cached pod list (call after creating/terminating pods).
+
+    The stale list is kept only as a fallback for API errors.
+    """
+    _pods_cache["t"] = float("-inf")
+
+# Last selected pod, offered as the default when several pods are running
+STATE_FILE = Path.home() / ".rpa_state.json"
+STATE_TTL = 1800
+
+def load_last_pod() -> Optional[Dict[str, Any]]:
+    """Return the saved {pod_id, info, ts} state if it is younger than STATE_TTL."""
+    try:
+        state = json.loads(STATE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if time.time() - state.get("ts", 0) > STATE_TTL:
+        return None
+    return state
+
+def save_last_pod(info: Dict[str, Any]) -> None:
+    try:
+        STATE_FILE.write_text(json.dumps({"pod_id": info["id"], "info": info, "ts": time.time()}))
+    except OSError:
+        pass
+
+def clear_last_pod() -> None:
+    try:
+        STATE_FILE.unlink()
+    except OSError:
+        pass
+
+def ssh_port_open(info: Dict[str, Any], timeout: float = 1.0) -> bool:
+    """Cheap liveness probe: does the pod's SSH endpoint accept a TCP connection?"""
+    try:
+        with socket.create_connection((info["ip"], int(info["port"])), timeout=timeout):
+            return True
+    except (OSError, ValueError):
+        return False
+
 def get_pod_config(template_key: str) -> Dict[str, Any]:
-    """Generate pod configuration from template."""
+    """Generate pod configuration from template (a fresh copy callers may edit)."""
+    config = _pod_config(template_key, HF_TOKEN or "")
+    return {**config, "env": dict(config["env"])}
+
+@lru_cache(maxsize=None)
+def _pod_config(template_key: str, hf_token: str) -> Dict[str, Any]:
     t = TEMPLATES[template_key]
     
     config = {
@@ -149,7 +270,7 @@ def get_pod_config(template_key: str) -> Dict[str, Any]:
         "ports": "8888/http,8188/http,3000/http,22/tcp",
         "volume_mount_path": "/workspace",
         "env": {
-            "HF_TOKEN": HF_TOKEN or "",
+            "HF_TOKEN": hf_token,
             "COMFYUI_LISTEN": "0.0.0.0",
             "COMFYUI_PORT": "8888",
         },
@@ -160,21 +281,22 @@ def wait_for_pod(pod_id: str, timeout: int = 300) -> Optional[Dict[str, Any]]:
     """Wait for pod to be ready with SSH access."""
     log.info(f"Waiting for pod {pod_id}...")
     start = time.time()
+    delay = 1.0  # backoff 1s -> 4s: quick pickup once ready, fewer calls while booting
     while time.time() - start < timeout:
         try:
-            pod = runpod.get_pod(pod_id)
+            pod = get_runpod().get_pod(pod_id)
         except Exception as e:
             log.warning(f"  API error ({e}), retrying...")
-            time.sleep(2)
-            continue
+            pod = None
             
-        if pod.get("desiredStatus") == "RUNNING":
+        if pod and pod.get("desiredStatus") == "RUNNING":
             runtime = pod.get("runtime") or {}
             ports = runtime.get("ports", [])
             for p in ports:
                 if p.get("privatePort") == 22 and p.get("isIpPublic"):
                     return pod
-        time.sleep(5)
+        time.sleep(delay + random.uniform(0, delay * 0.1))
+        delay = min(delay * 1.5, 4.0)
     raise TimeoutError("Pod failed to start.")
 
 def cmd_deploy(args):
@@ -190,25 +312,30 @@ def cmd_deploy(args):
     config = get_pod_config(template)
     
     # Check existing
-    pods = runpod.get_pods()
-    existing = [p for p in pods if p.get("name") == config["name"] and p.get("desiredStatus") == "RUNNING"]
+    pods = get_pods_cached()
+    existing = next(
+        (p for p in pods if p.get("name") == config["name"] and p.get("desiredStatus") == "RUNNING"),
+        None,
+    )
     
     if existing:
-        print(f"Found existing pod {existing[0]['id']}. Reusing.")
-        pod = existing[0]
+        print(f"Found existing pod {existing['id']}. Reusing.")
+        pod = existing
     else:
         print("Creating pod...")
         try:
-            pod = runpod.create_pod(**config)
+            pod = get_runpod().create_pod(**config)
         except Exception as e:
             print(f"Creation failed: {e}")
             if t["cloud_type"] == "COMMUNITY":
                 print("Retrying with SECURE cloud...")
                 config["cloud_type"] = "SECURE"
-                pod = runpod.create_pod(**config)
+                pod = get_runpod().create_pod(**config)
             else:
                 return
 
+    invalidate_pods_cache()
+    
     try:
         pod = wait_for_pod(pod["id"])
     except TimeoutError:
@@ -216,51 +343,36 @@ def cmd_deploy(args):
         return
 
     print(f"[OK] Pod {pod['id']} is active at {pod.get('ip', 'unknown')}")
-    info = get_running_pod_info(args) # Refresh info with proper SSH details
-    
-    # FIX: Removed duplicate provisioning block - handled once below in 'Provisioning' section
-    pod_host_id = pod.get('machine', {}).get('podHostId', 'unknown')
-    
-    ssh_ip = pod_host_id + ".runpod.io"
-    ssh_port = "22"
-    runtime = pod.get("runtime") or {}
-    ports = runtime.get("ports", [])
-    
-    for p in ports:
-        if p['privatePort'] == 22:
-            ssh_port = p['publicPort']
-            ssh_ip = p.get('ip', ssh_ip)
-            break
+    # SSH details come straight from the pod we just waited on; no second pod listing
+    info = pod_to_info(pod)
+    save_last_pod(info)
+    ssh_ip, ssh_port = info["ip"], info["port"]
             
     # Provisioning
     if not args.no_setup:
         print("Provisioning...")
-        time.sleep(5)
-        root_dir = Path(__file__).parent.parent
-        
-        # Determine scripts to upload based on template
+        # Upload as soon as sshd accepts connections instead of a fixed 5s sleep
+        deadline = time.monotonic() + 30
+        while not ssh_port_open(info) and time.monotonic() < deadline:
+            time.sleep(0.5)
         START_SCRIPT = t["script"]
-        SETUP_SCRIPT = t.get("setup_script", "setup_models.py") # Default to LTX setup
-        
-        files = [
-            root_dir / "docker" / START_SCRIPT,
-            root_dir / "scripts" / SETUP_SCRIPT,
-            root_dir / ".env"
-        ]
-        
-        key_path = os.path.expanduser(SSH_KEY_PATH)
         
-        for f in files:
-            if f.exists():
-                print(f"  Uploading {f.name}...")
-                dest = f"/workspace/{f.name}"
-                subprocess.run(f'scp -P {ssh_port} -i "{key_path}" -o StrictHostKeyChecking=no "{f}" root@{ssh_ip}:{dest}', shell=True, check=True, stdout=subprocess.DEVNULL)
+        # One scp for all files: a single handshake instead of one per file
+        files = [f for f in TEMPLATE_FILES[template] if f.exists()]
+        srcs = [str(f) for f in files]
+        if srcs:
+            print(f"  Uploading {', '.join(f.name for f in files)}...")
+            subprocess.run(
+                get_scp_argv(info) + [*srcs, f"root@{ssh_ip}:/workspace/"],
+                check=True, stdout=subprocess.DEVNULL
+            )
         
         print(f"  Triggering startup ({START_SCRIPT})...")
         # Use a more robust detach method: nohup ... < /dev/null > log 2>&1 &
         # And allow a brief moment for it to fork before ssh disconnects
         remote_cmd = f"chmod +x /workspace/{START_SCRIPT} && nohup /workspace/{START_SCRIPT} < /dev/null > /workspace/startup.log 2>&1 & sleep 1"
-        subprocess.run(f'ssh -p {ssh_port} -i "{key_path}" -o StrictHostKeyChecking=no root@{ssh_ip} "{remote_cmd}"', shell=True, check=True)
+        # Rides the ControlMaster opened by the scp above: no second handshake
+        subprocess.run(get_ssh_argv(info) + [remote_cmd], check=True)
 
     print("\n" + "="*50)
     print(f"DEPLOYMENT COMPLETE ({template})")
@@ -270,8 +382,27 @@ def cmd_deploy(args):
 
 def get_running_pod_info(args):
     """Helper to find the target running pod (PROD/VALUE/BUDGET)."""
+    # Explicit --pod: one targeted lookup, no listing or prompt
+    target = getattr(args, "target_pod", None)
+    if target:
+        try:
+            pod = get_runpod().get_pod(target)
+        except Exception as e:
+            print(f"Error fetching pod {target}: {e}")
+            return None
+        if not pod or pod.get("desiredStatus") != "RUNNING" or not (pod.get("runtime") or {}).get("ports"):
+            print(f"Pod {target} is not running.")
+            return None
+        info = pod_to_info(pod)
+        save_last_pod(info)
+        return info
+    
+    # The last selected pod is only a default: other pods may be running too
+    state = load_last_pod()
+    last_id = state.get("pod_id") if state else None
+    
     try:
-        pods = runpod.get_pods()
+        pods = get_pods_cached()
         running = [p for p in pods if p.get("desiredStatus") == "RUNNING"]
     except Exception as e:
         print(f"Error fetching pods: {e}")
@@ -282,13 +413,19 @@ def get_running_pod_info(args):
         
     # If multiple pods, ask the user
     if len(running) > 1:
-        print("\nMultiple active pods detected:")
-        for i, p in enumerate(running):
-            gpu = p.get("machine", {}).get("gpuDisplayName", "Unknown")
-            print(f"  [{i+1}] {p['id']:<20} {p.get('name'):<25} ({gpu})")
+        default = next((i for i, p in enumerate(running) if p["id"] == last_id), None)
+        rows = [
+            f"  [{i+1}] {p['id']:<20} {p.get('name'):<25} ({p.get('machine', {}).get('gpuDisplayName', 'Unknown')})"
+            + (" <- last used" if i == default else "")
+            for i, p in enumerate(running)
+        ]
+        print("\n".join(["\nMultiple active pods detected:", *rows]))
         
-        choice = input(f"\nSelect target pod (1-{len(running)}): ").strip()
-        if choice.isdigit() and 1 <= int(choice) <= len(running):
+        hint = f" [{default+1}]" if default is not None else ""
+        choice = input(f"\nSelect target pod (1-{len(running)}){hint}: ").strip()
+        if not choice and default is not None:
+            pod = running[default]
+        elif choice.isdigit() and 1 <= int(choice) <= len(running):
             pod = running[int(choice)-1]
         else:
             print("Invalid choice, defaulting to first pod.")
@@ -296,6 +433,12 @@ def get_running_pod_info(args):
     else:
         pod = running[0]
 
+    info = pod_to_info(pod)
+    save_last_pod(info)
+    return info
+
+def pod_to_info(pod):
+    """Extract the SSH connection details from a RunPod pod record."""
     pod_id = pod["id"]
     
     # Extract SSH info
@@ -326,11 +469,77 @@ def get_proxy_url(info, port=8888):
     # Pattern: https://{pod_id}-{port}.proxy.runpod.net/
     return f"https://{info['id']}-{port}.proxy.runpod.net/"
 
-def get_ssh_base_cmd(info):
-    """Generates the base SSH command string with keys and flags."""
-    key_path = os.path.expanduser(SSH_KEY_PATH)
-    # Quote key path for Windows safety
-    return f'ssh -p {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no root@{info["ip"]}'
+def get_ssh_argv(info, mux=True):
+    """Generates the base SSH argv (no local shell; remote command appended as one arg).
+    
+    Pass mux=False for long-lived tunnels so they own their connection
+    instead of attaching to (and outliving) the shared master.
+    """
+    mux_args = SSH_MUX_ARGS if mux else []
+    return ["ssh", "-p", str(info["port"]), *SSH_BASE_OPTS, *mux_args, f"root@{info['ip']}"]
+
+def get_scp_argv(info):
+    """Generates the base SCP argv; append sources and destination."""
+    return ["scp", "-P", str(info["port"]), *SSH_BASE_OPTS, *SSH_MUX_ARGS]
+
+def get_rsync_cmd(info):
+    """Generates the rsync argv prefix, tunnelled over the pod's SSH.
+    
+    Delta transfers with --partial/--inplace, so changed files only move
+    their differing blocks and an interrupted pull resumes. Cheap AEAD
+    cipher and no compression (-z/SSH): outputs are already-compressed
+    media. Unchanged files are skipped on repeat syncs.
+    """
+    rsh = (
+        f'ssh -p {info["port"]} -i "{KEY_PATH}" -o StrictHostKeyChecking=no '
+        f'-c aes128-gcm@openssh.com -o Compression=no {SSH_MUX_OPTS}'
+    )
+    return ["rsync", "-rlpt", "--partial", "--inplace", "--info=progress2", "-e", rsh.strip()]
+
+def open_tunnel(info, ports, title):
+    """Starts a background `ssh -N -L` tunnel and waits until it is listening.
+    
+    Runs ssh directly (no `start`/shell wrapper) so the same code path works
+    on every platform; Windows gets its own console window so the tunnel can
+    be closed independently. Returns the Popen handle, or None if the local
+    port never came up.
+    """
+    forwards = [arg for port in ports for arg in ("-L", f"{port}:127.0.0.1:{port}")]
+    argv = get_ssh_argv(info, mux=False)
+    argv[-1:-1] = ["-N", "-o", "ExitOnForwardFailure=yes", *forwards]
+    if IS_WINDOWS:
+        proc = subprocess.Popen(argv, creationflags=getattr(subprocess, "CREATE_NEW_CONSOLE", 0))
+    else:
+        proc = subprocess.Popen(
+            argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    
+    # Poll the first forwarded port instead of sleeping a fixed interval
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            log.error(f"[ERR] {title} exited early (code {proc.returncode}).")
+            return None
+        try:
+            with socket.create_connection(("127.0.0.1", ports[0]), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.25)
+    log.warning(f"[WARN] {title} not listening on {ports[0]} yet; continuing anyway.")
+    return proc
+
+# Disk, RAM, GPU, network and Wan2GP process report; piped to `bash -s`
+STATUS_SCRIPT = """\
+echo '--- DISK/RAM ---'
+df -h /workspace; free -h
+echo '--- GPU ---'
+nvidia-smi --query-gpu=gpu_name,utilization.gpu,memory.used,memory.total --format=csv,noheader
+echo '--- NETWORK ---'
+grep -E 'eth0|enp' /proc/net/dev
+echo '--- PROCESSES ---'
+ps aux | grep -v grep | grep -E 'wgp.py|python' || echo 'No AI services found.'
+"""
 
 def cmd_status(args):
     info = get_running_pod_info(args)
@@ -339,26 +548,11 @@ def cmd_status(args):
         return
         
     print(f"\n[STAT] Pod Status: {info['name']} ({info['id']})")
-    ssh_base = get_ssh_base_cmd(info)
-    
-    # Check Disk, RAM, GPU, Network and Wan2GP process
-    status_cmd = (
-        "echo '--- DISK/RAM ---' && "
-        "df -h /workspace && free -h && "
-        "echo '--- GPU ---' && "
-        "nvidia-smi --query-gpu=gpu_name,utilization.gpu,memory.used,memory.total --format=csv,noheader && "
-        "echo '--- NETWORK ---' && "
-        "cat /proc/net/dev | grep -E 'eth0|enp' && "
-        "echo '--- PROCESSES ---' && "
-        "ps aux | grep -v grep | grep -E 'wgp.py|python' || echo 'No AI services found.';"
-    )
     
-    full_cmd = f'{ssh_base} "{status_cmd}"'
-    subprocess.run(full_cmd, shell=True)
+    subprocess.run(get_ssh_argv(info) + ["bash -s"], input=STATUS_SCRIPT, text=True)
 
 def cmd_connect(args: argparse.Namespace) -> None:
     """Open SSH tunnel and launch browser."""
-    import webbrowser
     info = get_running_pod_info(args)
     if not info:
         log.warning("No running pods found.")
@@ -366,19 +560,10 @@ def cmd_connect(args: argparse.Namespace) -> None:
         
     log.info("   Opening Tunnel (8888, 3000, 7860 -> pod)...")
     
-    ssh_base = get_ssh_base_cmd(info)
-    tunnel_args = '-N -L 8888:127.0.0.1:8888 -L 3000:127.0.0.1:3000 -L 7860:127.0.0.1:7860'
-    full_cmd = f'{ssh_base} {tunnel_args}'
-    
-    # Cross-platform background process
-    if IS_WINDOWS:
-        subprocess.Popen(f'start "RunPod Tunnel (8888/3000/7860)" {full_cmd}', shell=True)
-    else:
-        subprocess.Popen(full_cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    
     log.info(f"[WEB] RunPod Proxy Link: {get_proxy_url(info, 8888)}")
     log.info("   Waiting for handshake...")
-    time.sleep(3)
+    if not open_tunnel(info, [8888, 3000, 7860], "RunPod Tunnel (8888/3000/7860)"):
+        return
     
     log.info("[OK] Launched browser.")
     webbrowser.open("http://127.0.0.1:8888")
@@ -391,16 +576,14 @@ def cmd_watch(args):
         return
         
     print(f"[OO] Watching logs on {info['name']}...")
-    key_path = os.path.expanduser(SSH_KEY_PATH)
-    ssh_base = get_ssh_base_cmd(info)
+    ssh_argv = get_ssh_argv(info)
     
     # Determine log file based on template
     log_file = "/workspace/startup.log"
     
     if "wan2gp" in info.get("name", ""):
         # Check if service log exists
-        check_cmd = f'{ssh_base} "test -f /workspace/wan2gp_service.log"'
-        if os.system(check_cmd) == 0:
+        if subprocess.run(ssh_argv + ["test -f /workspace/wan2gp_service.log"]).returncode == 0:
              log_file = "/workspace/wan2gp_service.log"
              print(f"   Target: {log_file} (Runtime)")
         else:
@@ -409,8 +592,7 @@ def cmd_watch(args):
         print(f"   Target: {log_file} (Startup)")
         
     # Tail the log
-    cmd = f'{ssh_base} "tail -f {log_file}"'
-    os.system(cmd)
+    subprocess.run(ssh_argv + [f"tail -f {log_file}"])
 
 def cmd_pull(args):
     info = get_running_pod_info(args)
@@ -418,19 +600,31 @@ def cmd_pull(args):
         print("No running pods found.")
         return
         
-    local_out = Path(__file__).parent.parent / "output"
+    local_out = ROOT_DIR / "output"
     local_out.mkdir(exist_ok=True)
     
     print(f"📥 Pulling media from {info['name']}...")
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     
     # Official ComfyUI output path
     remote_base = "/workspace/ComfyUI/output"
     
-    # Check if remote folder has files
-    ssh_base = get_ssh_base_cmd(info)
-    check_cmd = f'{ssh_base} "ls -A {remote_base} 2>/dev/null"'
-    files = os.popen(check_cmd).read().strip()
+    # rsync only ships new/changed outputs and is a no-op on an empty folder,
+    # so it needs no separate emptiness probe
+    rsync_cmd = get_rsync_cmd(info) + [f"root@{info['ip']}:{remote_base}/", f"{local_out}/"]
+    if HAS_RSYNC and subprocess.run(rsync_cmd).returncode == 0:
+        print(f"✅ Synced to {local_out}")
+        return
+    
+    # SCP fallback: a glob on an empty folder fails, so check first
+    try:
+        res = subprocess.run(
+            get_ssh_argv(info) + [f"ls -A {remote_base} 2>/dev/null"],
+            capture_output=True, text=True, timeout=15
+        )
+    except subprocess.TimeoutExpired:
+        print("❌ Pod did not respond.")
+        return
+    files = res.stdout.strip()
     
     if not files:
         print("⚠️  No files found in remote output.")
@@ -438,8 +632,7 @@ def cmd_pull(args):
 
     # SCP recursive
     remote_path = f"{remote_base}/*"
-    cmd = f'scp -P {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no -r root@{info["ip"]}:{remote_path} "{local_out}"'
-    os.system(cmd)
+    subprocess.run(get_scp_argv(info) + ["-r", f"root@{info['ip']}:{remote_path}", str(local_out)])
     
     print(f"✅ Synced to {local_out}")
 
@@ -454,44 +647,75 @@ def cmd_push(args):
         return
 
     print(f"📤 Pushing workflows to {info['name']}...")
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     
     # Official ComfyUI workflow standard location (for Sidebar access)
     # Official ComfyUI workflow standard location (for Sidebar access)
     remote_dir = "/workspace/ComfyUI/user/default/workflows"
-    ssh_base = get_ssh_base_cmd(info)
-    mkdir_cmd = f'{ssh_base} "mkdir -p {remote_dir}"'
-    subprocess.run(mkdir_cmd, shell=True, check=True)
-
-    for f in args.files:
-        print(f"   Transferring {f}...")
-        scp_cmd = f'scp -P {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no "{f}" root@{info["ip"]}:{remote_dir}/'
-        os.system(scp_cmd)
+    subprocess.run(get_ssh_argv(info) + [f"mkdir -p {remote_dir}"], check=True)
+
+    rsync_cmd = get_rsync_cmd(info) + list(args.files) + [f"root@{info['ip']}:{remote_dir}/"]
+    if HAS_RSYNC and subprocess.run(rsync_cmd).returncode == 0:
+        print("✅ Upload complete. (Check 'Workflows' in Comfy sidebar)")
+        return
+    
+    print(f"   Transferring {', '.join(args.files)}...")
+    files = list(args.files)
+    for i in range(0, len(files), SCP_BATCH):
+        subprocess.run(get_scp_argv(info) + files[i:i + SCP_BATCH] + [f"root@{info['ip']}:{remote_dir}/"])
         
     print("✅ Upload complete. (Check 'Workflows' in Comfy sidebar)")
 
 def cmd_wallet(args):
     try:
-        pods = runpod.get_pods()
+        pods = get_pods_cached()
         running = [p for p in pods if p.get("desiredStatus") == "RUNNING"]
         total_hourly = sum([p.get("costPerHr", 0) for p in running])
         
-        print(f"\n💰 Active Burn Rate: ${total_hourly:.3f}/hr")
-        print(f"   Active Pods: {len(running)}")
+        lines = [f"\n💰 Active Burn Rate: ${total_hourly:.3f}/hr", f"   Active Pods: {len(running)}"]
         if running:
-            print("   (Don't forget to terminate when done!)")
-        # print("")
+            lines.append("   (Don't forget to terminate when done!)")
+        print("\n".join(lines))
     except Exception as e:
         log.error(f"Error fetching wallet info: {e}")
 
+BLENDER_SHORTCUT_SCRIPT = """\
+mkdir -p /root/Desktop
+cat > /root/Desktop/Blender.desktop <<'DESKTOP'
+[Desktop Entry]
+Version=1.0
+Name=Blender 4.3
+Comment=Launch Blender
+Exec=/workspace/blender/blender
+Icon=utilities-terminal
+Terminal=false
+Type=Application
+Categories=Graphics;
+DESKTOP
+chmod +x /root/Desktop/Blender.desktop
+"""
+
+# Local sentinels for pods already known to have Blender installed
+BLENDER_CACHE_DIR = Path.home() / ".cache" / "rpa"
+BLENDER_CACHE_TTL = 3600
+
+def blender_marker(info) -> Path:
+    return BLENDER_CACHE_DIR / f"blender_{info['id']}"
+
 def ensure_blender(info):
     """Checks if blender is installed remotely, if not runs setup."""
+    marker = blender_marker(info)
+    try:
+        if time.time() - marker.stat().st_mtime < BLENDER_CACHE_TTL:
+            print("✅ Blender is ready.")
+            return
+    except OSError:
+        pass
+    
     print("Checking Blender installation...")
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     
     # Check if /workspace/blender/blender exists
-    check_cmd = f'ssh -p {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no root@{info["ip"]} "test -f /workspace/blender/blender && echo YES || echo NO"'
-    result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True).stdout.strip()
+    check_cmd = "test -f /workspace/blender/blender && echo YES || echo NO"
+    result = subprocess.run(get_ssh_argv(info) + [check_cmd], capture_output=True, text=True).stdout.strip()
     
     if result != "YES":
         print("🛠️ Blender/VNC not found. Installing...")
@@ -507,27 +731,27 @@ def ensure_blender(info):
         print(f"   Installing {gui_choice.upper()}... (This takes 3-5 mins)")
 
         # Upload setup script
-        setup_script = Path(__file__).parent.parent / "docker" / "setup_blender.sh"
-        scp_cmd = f'scp -P {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no "{setup_script}" root@{info["ip"]}:/workspace/'
-        subprocess.run(scp_cmd, shell=True, check=True)
+        setup_script = ROOT_DIR / "docker" / "setup_blender.sh"
+        subprocess.run(get_scp_argv(info) + [str(setup_script), f"root@{info['ip']}:/workspace/"], check=True)
         
         # Run it with argument
-        ssh_base = get_ssh_base_cmd(info)
-        run_cmd = f'{ssh_base} "chmod +x /workspace/setup_blender.sh && /workspace/setup_blender.sh {gui_choice}"'
-        subprocess.run(run_cmd, shell=True, check=True)
+        ssh_argv = get_ssh_argv(info)
+        run_cmd = f"chmod +x /workspace/setup_blender.sh && /workspace/setup_blender.sh {gui_choice}"
+        subprocess.run(ssh_argv + [run_cmd], check=True)
         
         # Create Desktop Shortcut
         print("   Creating Desktop Shortcut...")
-        shortcut_cmd = (
-            f'{ssh_base} "mkdir -p /root/Desktop && '
-            f'printf \\"[Desktop Entry]\\nVersion=1.0\\nName=Blender 4.3\\nComment=Launch Blender\\nExec=/workspace/blender/blender\\nIcon=utilities-terminal\\nTerminal=false\\nType=Application\\nCategories=Graphics;\\" > /root/Desktop/Blender.desktop && '
-            f'chmod +x /root/Desktop/Blender.desktop"'
-        )
-        subprocess.run(shortcut_cmd, shell=True)
+        subprocess.run(ssh_argv + ["bash -s"], input=BLENDER_SHORTCUT_SCRIPT, text=True)
         
         print("✅ Blender Installed.")
     else:
         print("✅ Blender is ready.")
+    
+    try:
+        BLENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError:
+        pass
 
 def cmd_render(args):
     if not args.file:
@@ -541,14 +765,12 @@ def cmd_render(args):
         
     ensure_blender(info)
     
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     file_path = Path(args.file)
     remote_blend = f"/workspace/{file_path.name}"
     
     # 1. Upload
     print(f"📤 Uploading {file_path.name}...")
-    scp_cmd = f'scp -P {info["port"]} -i "{key_path}" -o StrictHostKeyChecking=no "{file_path}" root@{info["ip"]}:{remote_blend}'
-    subprocess.run(scp_cmd, shell=True, check=True)
+    subprocess.run(get_scp_argv(info) + [str(file_path), f"root@{info['ip']}:{remote_blend}"], check=True)
     
     # 2. Render
     print("🎬 Starting Remote Render (Cycles)...")
@@ -556,16 +778,12 @@ def cmd_render(args):
     
     # We run this synchronously so we see the output
     # We run this synchronously so we see the output
-    ssh_base = get_ssh_base_cmd(info)
-    ssh_cmd = f'{ssh_base} "{render_cmd}"'
-    os.system(ssh_cmd)
+    subprocess.run(get_ssh_argv(info) + [render_cmd])
     
     print("\n✅ Render Complete.")
     print("   Run 'rpa pull' (or Option 6) to download the frames.")
 
 def cmd_vnc(args):
-    import webbrowser
-    import time
     info = get_running_pod_info(args)
     if not info:
         print("No running pods found.")
@@ -574,31 +792,21 @@ def cmd_vnc(args):
     # VNC should already be installed via startup script (setup_blender.sh)
     # Just verify it's running
     log.info("🖥️  Connecting to Desktop (VNC)...")
-    ssh_base = get_ssh_base_cmd(info)
+    ssh_argv = get_ssh_argv(info)
     
     # Quick check if VNC is running
-    check_cmd = f'{ssh_base} "pgrep -x Xtigervnc"'
-    result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True)
+    result = subprocess.run(ssh_argv + ["pgrep -x Xtigervnc"], capture_output=True, text=True)
     
     if not result.stdout.strip():
         log.warning("⚠️  VNC server not detected. Starting it now...")
-        start_cmd = f'{ssh_base} "vncserver :1 -geometry 1920x1080 -depth 24"'
-        subprocess.run(start_cmd, shell=True)
+        subprocess.run(ssh_argv + ["vncserver :1 -geometry 1920x1080 -depth 24"])
         time.sleep(2)
     
     log.info("   Opening Tunnel (127.0.0.1:5901 -> pod:5901)...")
     
-    tunnel_args = '-N -L 5901:127.0.0.1:5901'
-    full_cmd = f'{ssh_base} {tunnel_args}'
-    
-    # Cross-platform background process
-    if IS_WINDOWS:
-        subprocess.Popen(f'start "RunPod VNC Tunnel (5901)" {full_cmd}', shell=True)
-    else:
-        subprocess.Popen(full_cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    
     log.info("   Waiting for handshake...")
-    time.sleep(3)
+    if not open_tunnel(info, [5901], "RunPod VNC Tunnel (5901)"):
+        return
     
     log.info("\\n✅ Tunnel Launched.")
     log.info("   Open your VNC Viewer (RealVNC/TigerVNC) and connect to: 127.0.0.1:5901")
@@ -613,7 +821,6 @@ def cmd_reinstall_gui(args):
         return
 
     print(f"🧹 Clearing existing Blender/GUI markers on {info['name']}...")
-    ssh_base = get_ssh_base_cmd(info)
     
     # Remove the marker file so ensure_blender triggers again
     # We DO NOT delete the whole folder to preserve huge downloads if possible, 
@@ -626,7 +833,8 @@ def cmd_reinstall_gui(args):
         return
 
     # Remove marker
-    os.system(f'{ssh_base} "rm -f /workspace/blender/blender"')
+    subprocess.run(get_ssh_argv(info) + ["rm -f /workspace/blender/blender"])
+    blender_marker(info).unlink(missing_ok=True)
     
     print("[OK] Markers cleared.")
     print("[>>] Triggering new installation...")
@@ -639,32 +847,64 @@ def cmd_shell(args):
         return
         
     print(f"📟 Opening Remote Shell to {info['name']}...")
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     
     # Launch direct SSH session
-    ssh_base = get_ssh_base_cmd(info)
-    os.system(ssh_base)
+    subprocess.run(get_ssh_argv(info))
 
 def guess_category(url):
     """Attempt to auto-detect the destination folder from the URL path"""
     url_lower = url.lower()
     
-    # Sort folders by length descending to ensure we match 'clip_vision' before 'clip'
-    sorted_folders = sorted(MODEL_FOLDERS, key=len, reverse=True)
+    # Prefer a folder name that is a whole path segment, else any substring;
+    # among several hits the longest folder name wins.
+    for pattern in (_CAT_PART_RE, _CAT_ANY_RE):
+        hits = pattern.findall(url_lower)
+        if hits:
+            return min(hits, key=_FOLDER_RANK.__getitem__)
     
-    # Check for direct subfolder names in the URL path parts
-    parts = url_lower.split("/")
-    for folder in sorted_folders:
-        if folder in parts:
-            return folder
-            
-    # Fallback: check if the keyword shows up anywhere
-    for folder in sorted_folders:
-        if folder in url_lower:
-             return folder
-             
     return None
 
+_URL_SEPARATORS = str.maketrans(",", " ")
+
+INGEST_SCRIPT = "/tmp/rpa_ingest.sh"
+INGEST_LOG = "/workspace/ingest.log"
+
+def build_ingest_script(items):
+    """Build a remote bash script that downloads (url, folder) pairs.
+    
+    Uses aria2c (16 connections per file, 4 files at a time) when the pod
+    has it, otherwise falls back to wget jobs, also 4 at a time. The script
+    is uploaded and run detached on the pod (see cmd_ingest).
+    """
+    manifest = []
+    wget_cmds = []
+    dest_paths = []
+    for url, folder_name in items:
+        filename = url.split("/")[-1].split("?")[0]
+        dest_path = f"/workspace/ComfyUI/models/{folder_name}"
+        if dest_path not in dest_paths:
+            dest_paths.append(dest_path)
+        manifest.append(f"{url}\n  dir={dest_path}\n  out={filename}")
+        name = shlex.quote(filename)
+        wget_cmds += [
+            '[ "$(jobs -rp | wc -l)" -ge 4 ] && wait -n',
+            f"(wget -c -q --content-disposition -P {dest_path} {shlex.quote(url)}"
+            f" && echo \"   [DONE] \"{name} || echo \"   [FAIL] \"{name}) &",
+        ]
+    
+    return "\n".join([
+        f"mkdir -p {' '.join(dest_paths)}",
+        "if command -v aria2c >/dev/null 2>&1; then",
+        "aria2c -x16 -s16 -j4 -c --console-log-level=warn --summary-interval=0 --input-file=- <<'RPA_EOF'",
+        *manifest,
+        "RPA_EOF",
+        "else",
+        *wget_cmds,
+        "wait",
+        "fi",
+        "",
+    ])
+
 def cmd_ingest(args):
     info = get_running_pod_info(args)
     if not info:
@@ -682,15 +922,14 @@ def cmd_ingest(args):
         
     if not lines: return
     
-    # Flatten and clean URLs
-    all_raw = " ".join(lines).replace(",", " ")
-    urls = [u.strip() for u in all_raw.split() if u.strip().startswith("http")]
+    # Flatten and clean URLs (split() already drops surrounding whitespace)
+    all_raw = " ".join(lines).translate(_URL_SEPARATORS)
+    urls = [u for u in all_raw.split() if u.startswith("http")]
     
     if not urls:
         print("No valid URLs detected.")
         return
 
-    key_path = os.path.expanduser(SSH_KEY_PATH)
     
     ready_to_download = []
     needs_review = []
@@ -708,21 +947,26 @@ def cmd_ingest(args):
         print(f"\n⚡ Starting automatic ingestion ({len(ready_to_download)} files)...")
         for url, folder_name in ready_to_download:
             filename = url.split("/")[-1].split("?")[0]
-            dest_path = f"/workspace/ComfyUI/models/{folder_name}"
             print(f"   [AUTO] {filename} -> {folder_name}")
-            
-            # Use --show-progress and bar:force:noscroll. Avoid -q to ensure we see the progress bar.
-            # We wrap the command in quotes for SSH.
-            # Safe quoting for URL
-            safe_url = url.replace("'", "'\\''")
-            remote_cmd = f"mkdir -p {dest_path} && cd {dest_path} && wget -c --show-progress --progress=bar:force:noscroll --content-disposition '{safe_url}'"
-            ssh_base = get_ssh_base_cmd(info)
-            ssh_cmd = f'{ssh_base} "{remote_cmd}"'
-            os.system(ssh_cmd)
+        
+        # Ship the batch script and run it under nohup so the downloads survive a
+        # dropped connection or Ctrl+C; this session only follows the log.
+        remote_cmd = (
+            f"cat > {INGEST_SCRIPT} || exit 1; : > {INGEST_LOG}; "
+            f"nohup bash {INGEST_SCRIPT} > {INGEST_LOG} 2>&1 < /dev/null & "
+            f"tail -n +1 -f --pid=$! {INGEST_LOG}"
+        )
+        try:
+            subprocess.run(get_ssh_argv(info) + [remote_cmd], input=build_ingest_script(ready_to_download), text=True)
+        except KeyboardInterrupt:
+            print(f"\n   Detached. Downloads continue on the pod (log: {INGEST_LOG}).")
             
     # Phase 3: Deferred Review
     if needs_review:
         print(f"\n🧐 Reviewing {len(needs_review)} unknown links...")
+        # One remote shell drains picks in order while the next prompt is shown;
+        # the pipe is the queue, so input() never waits on a download.
+        worker = None
         for url in needs_review:
             filename = url.split("/")[-1].split("?")[0]
             print(f"\n❓ File: {filename}")
@@ -740,61 +984,77 @@ def cmd_ingest(args):
             folder_name = MODEL_FOLDERS[min(int(c_idx)-1, len(MODEL_FOLDERS)-1)]
             dest_path = f"/workspace/ComfyUI/models/{folder_name}"
             
-            print(f"   [USER] Downloading to {folder_name}...")
-            safe_url = url.replace("'", "'\\''")
-            remote_cmd = f"mkdir -p {dest_path} && cd {dest_path} && wget -c --show-progress --progress=bar:force:noscroll --content-disposition '{safe_url}'"
-            ssh_base = get_ssh_base_cmd(info)
-            ssh_cmd = f'{ssh_base} "{remote_cmd}"'
-            os.system(ssh_cmd)
+            print(f"   [USER] Queued for {folder_name}.")
+            if worker is None:
+                worker = subprocess.Popen(get_ssh_argv(info) + ["bash -s"], stdin=subprocess.PIPE, text=True)
+            name = shlex.quote(filename)
+            worker.stdin.write(
+                f"mkdir -p {dest_path} && wget -c -q --content-disposition -P {dest_path} {shlex.quote(url)}"
+                f" && echo \"   [DONE] \"{name} || echo \"   [FAIL] \"{name}\n"
+            )
+            worker.stdin.flush()
+        
+        if worker is not None:
+            print("\n   Waiting for queued downloads to finish...")
+            worker.stdin.close()
+            worker.wait()
             
     print("\n[OK] All ingest tasks finished.")
 
 # --- Dynamic TUI ---
-def cmd_interactive(args):
-    """The Main Menu Loop"""
-    while True:
-        # Clear Screen
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        print("==================================================")
-        print("           RUNPOD COMMAND CENTER (v2.1)")
-        print("==================================================")
-        print("")
-        
+def build_menu_str(templates):
+    """Render the whole main menu once; templates don't change at runtime."""
+    template_lines = [
+        f"   [{i+1}] Deploy {t['name'].split('-')[-1].capitalize().ljust(10)} ({t['desc']})"
+        for i, t in enumerate(templates.values())
+    ]
+    return "\n".join([
+        "==================================================",
+        "           RUNPOD COMMAND CENTER (v2.1)",
+        "==================================================",
+        "",
         # 1. Dynamic Deployment Section
-        print("   --- [>>] DEPLOYMENT ---")
-        template_keys = list(TEMPLATES.keys())
-        for i, key in enumerate(template_keys):
-            t = TEMPLATES[key]
-            # Print index + 1
-            print(f"   [{i+1}] Deploy {t['name'].split('-')[-1].capitalize().ljust(10)} ({t['desc']})")
-        print("")
-
+        "   --- [>>] DEPLOYMENT ---",
+        *template_lines,
+        "",
         # 2. Management Section
-        print("   --- [TOOL] MANAGEMENT ---")
-        print("   [C] Connect (Tunnel)")
-        print("   [W] Watch Logs")
-        print("   [S] Check Status")
-        print("   [P] Pull Content")
-        print("   [$] Wallet Check")
-        print("   [H] Open Shell (Terminal)")
-        print("   [I] Ingest Models (URL)")
-        print("")
-
+        "   --- [TOOL] MANAGEMENT ---",
+        "   [C] Connect (Tunnel)",
+        "   [W] Watch Logs",
+        "   [S] Check Status",
+        "   [P] Pull Content",
+        "   [$] Wallet Check",
+        "   [H] Open Shell (Terminal)",
+        "   [I] Ingest Models (URL)",
+        "",
         # 3. Blender Section
-        print("   --- [ART] BLENDER ---")
-        print(f"   [B] Render File")
-        print(f"   [V] VNC Desktop")
-        print(f"   [R] Reinstall Blender & GUI (Fresh Setup)")
-        print("")
-
+        "   --- [ART] BLENDER ---",
+        "   [B] Render File",
+        "   [V] VNC Desktop",
+        "   [R] Reinstall Blender & GUI (Fresh Setup)",
+        "",
         # 4. Admin Section
-        print("   --- [CFG] ADMIN ---")
-        print(f"   [L] List Pods")
-        print(f"   [K] Terminate Pod")
-        print(f"   [Q] Quit")
-        print("")
-        print("==================================================")
+        "   --- [CFG] ADMIN ---",
+        "   [L] List Pods",
+        "   [K] Terminate Pod",
+        "   [Q] Quit",
+        "",
+        "==================================================",
+    ])
+
+_MENU_STATIC = build_menu_str(TEMPLATES)
+
+# Erase display + cursor home; written with the menu instead of forking cls/clear
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+def cmd_interactive(args):
+    """The Main Menu Loop"""
+    template_keys = list(TEMPLATES.keys())
+    if IS_WINDOWS:
+        os.system("")  # enables VT escape processing in the Windows console
+    
+    while True:
+        print(CLEAR_SCREEN + _MENU_STATIC)
         
         choice = input("Select Option: ").strip().upper()
         
@@ -877,35 +1137,45 @@ def cmd_interactive(args):
 
 def cmd_list(args):
     try:
-        pods = runpod.get_pods()
-        print(f"{'ID':<20} {'Name':<25} {'GPU':<20} {'Status':<10} {'Cost'}")
-        print("-" * 90)
-        for p in pods:
-            gpu = p.get("machine", {}).get("gpuDisplayName", "Unknown")
-            print(f"{p['id']:<20} {p.get('name'):<25} {gpu:<20} {p['desiredStatus']:<10} {p.get('costPerHr')}")
+        pods = get_pods_cached()
+        rows = [
+            f"{p['id']:<20} {p.get('name'):<25} {p.get('machine', {}).get('gpuDisplayName', 'Unknown'):<20} "
+            f"{p['desiredStatus']:<10} {p.get('costPerHr')}"
+            for p in pods
+        ]
+        # Emit the whole table in one write
+        sys.stdout.write("\n".join([f"{'ID':<20} {'Name':<25} {'GPU':<20} {'Status':<10} {'Cost'}", "-" * 90, *rows]) + "\n")
     except Exception as e:
         print(f"Error listing: {e}")
 
 def cmd_terminate(args):
     pid = args.pod_id
+    pod_ids = []
     
-    if not pid:
+    if getattr(args, "all_running", False):
+        try:
+            pod_ids = [p["id"] for p in get_pods_cached() if p.get("desiredStatus") == "RUNNING"]
+        except Exception as e:
+            print(f"Error fetching pods: {e}")
+            return
+        if not pod_ids:
+            print("No active pods found to terminate.")
+            return
+    elif not pid:
         # Interactive Mode: Fetch and Ask
         try:
-            pods = runpod.get_pods()
+            pods = get_pods_cached()
             running = [p for p in pods if p.get("desiredStatus") == "RUNNING"]
             
             if not running:
                 print("No active pods found to terminate.")
                 return
                 
-            print("\nActive Pods:")
-            print(f"{'#':<3} {'ID':<20} {'Name':<25} {'Cost'}")
-            print("-" * 60)
-            
-            for i, p in enumerate(running):
-                 print(f"{i+1:<3} {p['id']:<20} {p.get('name'):<25} ${p.get('costPerHr')}/hr")
-            print("-" * 60)
+            rows = [
+                f"{i+1:<3} {p['id']:<20} {p.get('name'):<25} ${p.get('costPerHr')}/hr"
+                for i, p in enumerate(running)
+            ]
+            print("\n".join(["\nActive Pods:", f"{'#':<3} {'ID':<20} {'Name':<25} {'Cost'}", "-" * 60, *rows, "-" * 60]))
             
             choice = input(f"\nSelect Pod # to Terminate (1-{len(running)}) or Enter to Cancel: ").strip()
             
@@ -923,17 +1193,37 @@ def cmd_terminate(args):
             print(f"Error fetching pods: {e}")
             return
 
-    if pid:
-        confirm = input(f"Are you sure you want to terminate {pid}? (y/N): ").lower()
-        if confirm == 'y':
-            print(f"Terminating {pid}...")
-            runpod.terminate_pod(pid)
-            print("Done. (Billing stopped)")
-        else:
+    if pid and not pod_ids:
+        pod_ids = [pid]
+    if not pod_ids:
+        return
+    
+    if not getattr(args, "yes", False):
+        confirm = input(f"Are you sure you want to terminate {', '.join(pod_ids)}? (y/N): ").lower()
+        if confirm != 'y':
             print("Operation cancelled.")
+            return
+    
+    print(f"Terminating {', '.join(pod_ids)}...")
+    rp = get_runpod()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(8, len(pod_ids))) as pool:
+        futures = {pool.submit(rp.terminate_pod, p): p for p in pod_ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  Failed to terminate {futures[future]}: {e}")
+    invalidate_pods_cache()
+    clear_last_pod()
+    if failed < len(pod_ids):
+        print("Done. (Billing stopped)")
 
 def main():
     parser = argparse.ArgumentParser(description="RunPod Automation (RPA)")
+    parser.add_argument("--pod", dest="target_pod", metavar="POD_ID",
+                        help="Target this pod directly instead of listing running pods")
     subparsers = parser.add_subparsers(dest="command")
     
     # Deploy
@@ -947,6 +1237,8 @@ def main():
     # Terminate
     p_term = subparsers.add_parser("terminate")
     p_term.add_argument("pod_id", nargs="?", help="Pod ID (Optional if only one running)")
+    p_term.add_argument("--all-running", action="store_true", help="Terminate every running pod")
+    p_term.add_argument("-y", "--yes", action="store_true", help="Skip the confirmation prompt")
     
     # New Commands
     subparsers.add_parser("connect")
@@ -973,44 +1265,26 @@ def main():
     
     args = parser.parse_args()
     
-    if args.command == "deploy":
-        if not args.template:
-             print("Error: Template argument required for CLI mode (e.g. 'prod').")
-             return
-        cmd_deploy(args)
-    elif args.command == "list":
-        cmd_list(args)
-    elif args.command == "terminate":
-        cmd_terminate(args)
-    elif args.command == "connect":
-        cmd_connect(args)
-    elif args.command == "watch":
-        cmd_watch(args)
-    elif args.command == "status":
-        cmd_status(args)
-    elif args.command == "pull":
-        cmd_pull(args)
-    elif args.command == "push":
-        cmd_push(args)
-    elif args.command == "wallet":
-        cmd_wallet(args)
-    elif args.command == "shell":
-        cmd_shell(args)
-    elif args.command == "ingest":
-        cmd_ingest(args)
-    elif args.command == "render":
-        cmd_render(args)
-    elif args.command == "vnc":
-        cmd_vnc(args)
-    elif args.command == "reinstall":
-        cmd_reinstall_gui(args)
-    elif args.command == "interactive":
-        cmd_interactive(args)
-    else:
-        # Default to interactive if no args, or print help
-        # parser.print_help()
-        # Make default interactive for smooth experience
-        cmd_interactive(args)
+    commands = {
+        "deploy": cmd_deploy,
+        "list": cmd_list,
+        "terminate": cmd_terminate,
+        "connect": cmd_connect,
+        "watch": cmd_watch,
+        "status": cmd_status,
+        "pull": cmd_pull,
+        "push": cmd_push,
+        "wallet": cmd_wallet,
+        "shell": cmd_shell,
+        "ingest": cmd_ingest,
+        "render": cmd_render,
+        "vnc": cmd_vnc,
+        "reinstall": cmd_reinstall_gui,
+        "interactive": cmd_interactive,
+    }
+    
+    # No subcommand: default to interactive for a smooth experience
+    commands.get(args.command, cmd_interactive)(args)
 
 if __name__ == "__main__":
     main()
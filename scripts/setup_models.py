@@ -6,20 +6,44 @@ Downloads all required models to appropriate directories.
 Supports resume on interrupted downloads.
 """
 
+import importlib.util
 import os
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-try:
-    from huggingface_hub import hf_hub_download, snapshot_download
-except ImportError:
+if importlib.util.find_spec("huggingface_hub") is None:
     print("Installing huggingface_hub...")
-    os.system("pip install -q huggingface_hub")
-    from huggingface_hub import hf_hub_download, snapshot_download
+    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "huggingface_hub", "hf_transfer"])
+    importlib.invalidate_caches()
+
+# Multi-connection downloads; huggingface_hub reads these at import time.
+# hf_transfer must only be enabled when installed, or every download fails.
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
+from huggingface_hub import get_hf_file_metadata, hf_hub_download, hf_hub_url, snapshot_download
+
+
+def _env_workers(name: str, default: int) -> int:
+    """Read a worker count (>= 1); a malformed value is never fatal."""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
 
 # Configuration
 COMFYUI_BASE = os.getenv("COMFYUI_PATH", "/workspace/ComfyUI")
 HF_TOKEN = os.getenv("HF_TOKEN")
+# Files downloaded concurrently
+PARALLEL_WORKERS = _env_workers("HF_PARALLEL_WORKERS", 4)
+# Files fetched in parallel within one snapshot_download
+SNAPSHOT_WORKERS = _env_workers("HF_SNAPSHOT_WORKERS", 8)
 
 # Model registry - Updated with nikhil-file preferred models
 MODELS = {
@@ -123,46 +147,138 @@ MODELS = {
 }
 
 
-def check_model_exists(dest_dir: str, filename: str) -> bool:
-    """Check if a model file already exists and has non-zero size."""
-    filepath = Path(dest_dir) / Path(filename).name
-    return filepath.exists() and filepath.stat().st_size > 0
+@lru_cache(maxsize=None)
+def scan_dir(dest_dir: str) -> Dict[str, int]:
+    """Map file name -> size for one destination dir (scanned once per run)."""
+    try:
+        with os.scandir(dest_dir) as it:
+            return {e.name: e.stat().st_size for e in it if e.is_file()}
+    except OSError:
+        return {}
 
 
-def download_model(config: dict, dry_run: bool = False) -> bool:
-    """Download a single model configuration."""
-    repo = config["repo"]
-    dest = config["dest"]
-    gated = config["gated"]
+def check_model_exists(dest_dir: str, filename: str, expected_size: Optional[int] = None) -> bool:
+    """Check if a model file already exists with non-zero (or the expected) size."""
+    size = scan_dir(dest_dir).get(Path(filename).name, 0)
+    return size > 0 and (expected_size is None or size == expected_size)
+
+
+def fetch_remote_sizes(configs: Iterable[dict]) -> Dict[Tuple[str, str], int]:
+    """Look up Hub sizes for files already on disk, to catch truncated copies.
+    
+    Metadata requests run concurrently; files whose size can't be fetched
+    (offline, gated without a token) are left out and trusted as-is.
+    """
+    jobs = []
+    for config in configs:
+        renames = config.get("rename", {})
+        for filename in config["files"]:
+            if check_model_exists(config["dest"], renames.get(filename, filename)):
+                jobs.append((config, filename))
+    if not jobs:
+        return {}
     
-    os.makedirs(dest, exist_ok=True)
+    def _size(job):
+        config, filename = job
+        try:
+            token = HF_TOKEN if config["gated"] else None
+            return get_hf_file_metadata(hf_hub_url(config["repo"], filename), token=token).size
+        except Exception:
+            return None
     
-    success = True
+    with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as pool:
+        sizes = list(pool.map(_size, jobs))
+    return {(c["repo"], f): size for (c, f), size in zip(jobs, sizes) if size is not None}
+
+
+def pending_files(config: dict, dry_run: bool = False,
+                  remote_sizes: Optional[Dict[Tuple[str, str], int]] = None) -> List[str]:
+    """Report a model's files and return the ones that still need downloading."""
+    dest = config["dest"]
+    pending = []
+    renames = config.get("rename", {})
     for filename in config["files"]:
-        # Check if already downloaded
-        if check_model_exists(dest, filename):
+        # Check if already downloaded (under its final name)
+        local_name = renames.get(filename, filename)
+        expected = (remote_sizes or {}).get((config["repo"], filename))
+        if check_model_exists(dest, local_name, expected):
             print(f"  ✓ {filename} (already exists)")
             continue
         
+        if expected is not None and check_model_exists(dest, local_name):
+            print(f"  ⚠ {filename} (size mismatch, re-downloading)")
+            if not dry_run:
+                (Path(dest) / Path(local_name).name).unlink(missing_ok=True)
+        
         if dry_run:
             print(f"  → Would download: {filename}")
             continue
         
-        print(f"  ⏳ Downloading: {filename}...")
-        try:
-            token = HF_TOKEN if gated else None
-            hf_hub_download(
-                repo_id=repo,
-                filename=filename,
-                local_dir=dest,
-                token=token,
-            )
-            print(f"  ✓ {filename}")
-        except Exception as e:
-            print(f"  ✗ {filename}: {e}")
-            success = False
+        pending.append(filename)
+    
+    return pending
+
+
+def download_file(config: dict, filename: str) -> bool:
+    """Download one file of a model configuration."""
+    print(f"  ⏳ Downloading: {filename}...")
+    try:
+        token = HF_TOKEN if config["gated"] else None
+        path = hf_hub_download(
+            repo_id=config["repo"],
+            filename=filename,
+            local_dir=config["dest"],
+            token=token,
+        )
+        new_name = config.get("rename", {}).get(filename)
+        if new_name:
+            # Single atomic move to the name ComfyUI workflows expect
+            os.replace(path, Path(config["dest"]) / new_name)
+        print(f"  ✓ {filename}")
+        return True
+    except Exception as e:
+        print(f"  ✗ {filename}: {e}")
+        return False
+
+
+def download_snapshot(config: dict, files: List[str]) -> bool:
+    """Download a "snapshot" model's files in one call (repo layout preserved)."""
+    print(f"  ⏳ Downloading snapshot: {config['repo']}...")
+    try:
+        token = HF_TOKEN if config["gated"] else None
+        snapshot_download(
+            repo_id=config["repo"],
+            local_dir=config["dest"],
+            allow_patterns=files,
+            max_workers=SNAPSHOT_WORKERS,
+            token=token,
+        )
+        print(f"  ✓ {config['repo']}")
+        return True
+    except Exception as e:
+        print(f"  ✗ {config['repo']}: {e}")
+        return False
+
+
+def download_all(jobs: List[Callable[[], bool]]) -> bool:
+    """Run download jobs concurrently; each is network-bound."""
+    if not jobs:
+        return True
     
-    return success
+    pool = ThreadPoolExecutor(max_workers=min(PARALLEL_WORKERS, len(jobs)))
+    try:
+        futures = [pool.submit(job) for job in jobs]
+        results = [f.result() for f in as_completed(futures)]
+    except KeyboardInterrupt:
+        # Worker threads can't be interrupted; partial files resume on the next run
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("\n⚠️  Interrupted.")
+        # os._exit skips stdio flushing; stdout is block-buffered under start.sh's log
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)
+    pool.shutdown()
+    return all(results)
 
 
 def main():
@@ -182,17 +298,31 @@ def main():
     print(f"{'='*50}")
     print(f"Base path: {COMFYUI_BASE}")
     print(f"HF Token: {'Set' if HF_TOKEN else 'Not set'}")
+    print(f"hf_transfer: {'On' if os.environ.get('HF_HUB_ENABLE_HF_TRANSFER') == '1' else 'Off'}")
     print(f"Mode: {'Dry run' if args.dry_run else 'Download'}")
     print(f"{'='*50}\n")
     
     models_to_download = {args.model: MODELS[args.model]} if args.model else MODELS
     
-    all_success = True
+    # Many models share a destination; create each one once
+    for dest in {config["dest"] for config in models_to_download.values()}:
+        os.makedirs(dest, exist_ok=True)
+    
+    remote_sizes = fetch_remote_sizes(models_to_download.values())
+    
+    jobs = []
     for name, config in models_to_download.items():
         print(f"\n[{name}] {config['repo']}")
         print(f"  Destination: {config['dest']}")
-        if not download_model(config, args.dry_run):
-            all_success = False
+        pending = pending_files(config, args.dry_run, remote_sizes)
+        if pending and config.get("type") == "snapshot":
+            jobs.append(partial(download_snapshot, config, pending))
+        else:
+            jobs.extend(partial(download_file, config, filename) for filename in pending)
+    
+    if jobs:
+        print(f"\nRunning {len(jobs)} download(s), {min(PARALLEL_WORKERS, len(jobs))} at a time...")
+    all_success = download_all(jobs)
     
     print(f"\n{'='*50}")
     if all_success: